@@ -1,19 +1,20 @@
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.security import require_api_key
-from app.ml.feature_breakdown import FeatureBreakdownModel
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_feature_breakdown_model
 from app.utils.logger import get_logger
 
 router = APIRouter(
     prefix="/api/ml/features",
     tags=["Feature Breakdown"],
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 
 logger = get_logger(__name__)
-feature_breakdown_model = FeatureBreakdownModel()
+feature_breakdown_model = get_feature_breakdown_model()
 
 
 @router.post("/analyze")
@@ -31,7 +32,8 @@ async def analyze_feature(payload: Dict[str, Any]) -> Dict[str, Any]:
         if not title or not description:
             raise HTTPException(status_code=400, detail="title and description are required")
 
-        analysis = feature_breakdown_model.analyze_feature(
+        analysis = await run_in_threadpool(
+            feature_breakdown_model.analyze_feature,
             title=title,
             description=description,
             business_value=business_value,
@@ -62,7 +64,8 @@ async def breakdown_feature(payload: Dict[str, Any]) -> Dict[str, Any]:
         if not title or not description:
             raise HTTPException(status_code=400, detail="title and description are required")
 
-        result = feature_breakdown_model.break_down_feature(
+        result = await run_in_threadpool(
+            feature_breakdown_model.break_down_feature,
             title=title,
             description=description,
             business_value=business_value,
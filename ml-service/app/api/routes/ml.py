@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 
-from app.core.security import require_api_key
+from app.core.security import api_key_dependencies
 from app.schemas.ml import (
     AnalysisRequest,
     AnalysisResult,
@@ -10,7 +10,7 @@ from app.schemas.ml import (
 )
 from app.services.ml_service import ml_service
 
-router = APIRouter(dependencies=[Depends(require_api_key)])
+router = APIRouter(dependencies=api_key_dependencies)
 
 
 @router.get("/info", response_model=ModelCatalog)
@@ -2,18 +2,19 @@
 NLP Analysis API Routes
 Advanced NLP analysis for feature descriptions
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 
-from app.core.security import require_api_key
-from app.ml.advanced_feature_nlp import nlp_analyzer
+from app.core.security import api_key_dependencies
+from app.ml.advanced_feature_nlp import get_nlp_analyzer
 from app.utils.logger import get_logger
 
 router = APIRouter(
     prefix="/api/ml/features",
     tags=["Feature NLP Analysis"],
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 
 logger = get_logger(__name__)
@@ -43,15 +44,19 @@ async def analyze_feature_nlp(request: FeatureAnalysisRequest):
     Perform advanced NLP analysis on feature description.
     """
     try:
+        # First use loads the models; keep that off the event loop
+        nlp_analyzer = await run_in_threadpool(get_nlp_analyzer)
+
         # Analyze feature
-        analysis = nlp_analyzer.analyze_feature(
+        analysis = await run_in_threadpool(
+            nlp_analyzer.analyze_feature,
             title=request.title,
             description=request.description,
             business_value=request.business_value,
         )
 
         # Generate user stories
-        stories = nlp_analyzer.generate_user_stories(analysis, request.title)
+        stories = await run_in_threadpool(nlp_analyzer.generate_user_stories, analysis, request.title)
 
         # Calculate confidence
         confidence = analysis["intents"]["scores"].get(
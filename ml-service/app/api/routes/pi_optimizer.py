@@ -1,19 +1,20 @@
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.security import require_api_key
-from app.ml.pi_optimizer import PIOptimizer
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_pi_optimizer
 from app.utils.logger import get_logger
 
 router = APIRouter(
     prefix="/api/ml/pi",
     tags=["PI Optimizer"],
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 
 logger = get_logger(__name__)
-pi_optimizer = PIOptimizer()
+pi_optimizer = get_pi_optimizer()
 
 
 @router.post("/optimize")
@@ -31,7 +32,7 @@ async def optimize_pi(payload: Dict[str, Any]) -> Dict[str, Any]:
         if not sprints:
             raise HTTPException(status_code=400, detail="Sprints are required")
 
-        result = pi_optimizer.optimize(features, sprints, dependencies)
+        result = await run_in_threadpool(pi_optimizer.optimize, features, sprints, dependencies)
 
         return result
     except Exception as e:
@@ -1,71 +1,107 @@
-from typing import Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.security import require_api_key
-from app.ml.risk_analyzer import RiskAnalyzerModel
+from app.core.cache_keys import risk_alerts_key
+from app.core.redis_cache import cache_utils
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_risk_analyzer
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/api/ml/risks", tags=["Risk Analysis"])
 logger = get_logger(__name__)
-risk_model = RiskAnalyzerModel()
+risk_model = get_risk_analyzer()
+
+ALERT_SCORE_THRESHOLD = 60
+ALERTS_CACHE_TTL = 60
+ALERTS_CACHE_SIZE = 1024
+
+# team_id -> (expires_at, alerts payload); answers repeat polls without a Redis round-trip.
+# team_id comes from the client, so the cache is a bounded LRU rather than a plain dict.
+_alerts_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_alerts_cache_lock = threading.Lock()
 
 
 @router.post(
     "/analyze-project",
     summary="Analyze project-level risks",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def analyze_project(payload: Dict[str, Any]) -> Dict[str, Any]:
     project_id = payload.get("project_id")
     if not project_id:
         raise HTTPException(status_code=400, detail="project_id is required")
-    return risk_model.analyze_project_risks(project_id)
+    return await run_in_threadpool(risk_model.analyze_project_risks, project_id)
 
 
 @router.post(
     "/analyze-sprint",
     summary="Analyze sprint-specific risks",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def analyze_sprint(payload: Dict[str, Any]) -> Dict[str, Any]:
     sprint_id = payload.get("sprint_id")
     if not sprint_id:
         raise HTTPException(status_code=400, detail="sprint_id is required")
-    return risk_model.analyze_sprint_risks(sprint_id)
+    return await run_in_threadpool(risk_model.analyze_sprint_risks, sprint_id)
 
 
 @router.post(
     "/detect-bottlenecks",
     summary="Detect overloaded developers",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def detect_bottlenecks(payload: Dict[str, Any]) -> Dict[str, Any]:
     team_id = payload.get("team_id")
     if not team_id:
         raise HTTPException(status_code=400, detail="team_id is required")
-    return {"bottlenecks": risk_model.detect_bottlenecks("team", team_id)}
+    bottlenecks = await run_in_threadpool(risk_model.detect_bottlenecks, "team", team_id)
+    return {"bottlenecks": bottlenecks}
 
 
 @router.post(
     "/predict-delays",
     summary="Predict sprint delays",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def predict_delays(payload: Dict[str, Any]) -> Dict[str, Any]:
     sprint_id = payload.get("sprint_id")
     if not sprint_id:
         raise HTTPException(status_code=400, detail="sprint_id is required")
-    return risk_model.predict_delays("sprint", sprint_id)
+    return await run_in_threadpool(risk_model.predict_delays, "sprint", sprint_id)
 
 
 @router.get(
     "/alerts/{team_id}",
     summary="Get active risk alerts for a team",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
-async def risk_alerts(team_id: str) -> Dict[str, Any]:
-    risks = risk_model.analyze_project_risks(team_id)
-    alerts = [risk for risk in risks.get("risk_factors", []) if risk["score"] >= 60]
-    return {"alerts": alerts}
+async def risk_alerts(team_id: str, response: Response) -> Dict[str, Any]:
+    response.headers["Cache-Control"] = f"public, max-age={ALERTS_CACHE_TTL}"
+
+    with _alerts_cache_lock:
+        entry = _alerts_cache.get(team_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _alerts_cache.move_to_end(team_id)
+                return entry[1]
+            del _alerts_cache[team_id]
+
+    cache_key = risk_alerts_key(team_id, ALERT_SCORE_THRESHOLD)
+    result = cache_utils.get(cache_key)
+    if not result:
+        alerts = await run_in_threadpool(risk_model.get_high_severity_alerts, team_id, ALERT_SCORE_THRESHOLD)
+        result = {"alerts": alerts}
+        cache_utils.set(cache_key, result, ALERTS_CACHE_TTL)
+
+    with _alerts_cache_lock:
+        _alerts_cache[team_id] = (time.monotonic() + ALERTS_CACHE_TTL, result)
+        _alerts_cache.move_to_end(team_id)
+        while len(_alerts_cache) > ALERTS_CACHE_SIZE:
+            _alerts_cache.popitem(last=False)
+    return result
 
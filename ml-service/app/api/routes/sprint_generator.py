@@ -1,19 +1,20 @@
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.security import require_api_key
-from app.ml.sprint_generator import SprintAutoGenerator
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_sprint_generator
 from app.utils.logger import get_logger
 
 router = APIRouter(
     prefix="/api/ml/sprints",
     tags=["Sprint Generator"],
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 
 logger = get_logger(__name__)
-sprint_generator = SprintAutoGenerator()
+sprint_generator = get_sprint_generator()
 
 
 @router.post("/auto-generate")
@@ -35,7 +36,8 @@ async def auto_generate_sprint_plan(payload: Dict[str, Any]) -> Dict[str, Any]:
         if not available_stories:
             raise HTTPException(status_code=400, detail="available_stories are required")
 
-        result = sprint_generator.generate_plan(
+        result = await run_in_threadpool(
+            sprint_generator.generate_plan,
             sprint_id=sprint_id,
             capacity=capacity,
             team_members=team_members,
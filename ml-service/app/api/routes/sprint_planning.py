@@ -1,15 +1,30 @@
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends
+import numpy as np
+from fastapi import APIRouter
 
 from app.core.database import fetch_users_by_ids
-from app.core.security import require_api_key
-from app.ml.sprint_planner import SprintPlannerModel
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_sprint_planner
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/api/ml/sprints", tags=["Sprint Planning"])
 logger = get_logger(__name__)
-planner = SprintPlannerModel()
+planner = get_sprint_planner()
+
+
+# Fields every normalized member carries; dicts that already have them are passed through.
+_REQUIRED_MEMBER_KEYS = frozenset(
+    (
+        "user_id",
+        "_id",
+        "name",
+        "skills",
+        "capacity",
+        "current_workload",
+        "on_vacation",
+    )
+)
 
 
 def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
@@ -29,6 +44,9 @@ def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
         # Already in dict format, but ensure required fields exist
         normalized = []
         for member in team_members:
+            if _REQUIRED_MEMBER_KEYS <= member.keys():
+                normalized.append(member)
+                continue
             normalized_member = {
                 "user_id": member.get("user_id") or member.get("_id") or str(member.get("id", "")),
                 "_id": member.get("_id") or member.get("user_id") or str(member.get("id", "")),
@@ -49,7 +67,7 @@ def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
 @router.post(
     "/optimize-plan",
     summary="Optimize sprint plan based on capacity and backlog",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def optimize_sprint_plan(payload: Dict[str, Any]) -> Dict[str, Any]:
     team_members_raw = payload.get("team_members", [])
@@ -66,15 +84,16 @@ async def optimize_sprint_plan(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post(
     "/predict-velocity",
     summary="Predict team velocity for upcoming sprint",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def predict_velocity(payload: Dict[str, Any]) -> Dict[str, Any]:
     history = payload.get("historical_velocities", [])
     if not history:
         return {"predicted_velocity": 0, "confidence_interval": [0, 0], "confidence": 0.0}
 
-    mean_velocity = sum(history) / len(history)
-    std_dev = (sum((v - mean_velocity) ** 2 for v in history) / len(history)) ** 0.5
+    velocities = np.asarray(history, dtype=np.float64)
+    mean_velocity = float(velocities.mean())
+    std_dev = float(velocities.std())
 
     return {
         "predicted_velocity": round(mean_velocity),
@@ -86,7 +105,7 @@ async def predict_velocity(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post(
     "/simulate",
     summary="Simulate sprint outcome for selected stories",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def simulate_sprint(payload: Dict[str, Any]) -> Dict[str, Any]:
     stories = payload.get("stories", [])
@@ -103,7 +122,7 @@ async def simulate_sprint(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post(
     "/suggest-stories",
     summary="Suggest top backlog stories based on constraints",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def suggest_stories(payload: Dict[str, Any]) -> Dict[str, Any]:
     backlog = payload.get("available_stories", [])
@@ -1,16 +1,122 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 
+from app.core.cache_keys import task_assign_key
 from app.core.database import fetch_users_by_ids
-from app.core.security import require_api_key
-from app.core.redis_cache import cache_prediction
-from app.ml.task_assignment import TaskAssignmentModel
+from app.core.security import api_key_dependencies
+from app.core.redis_cache import cache_prediction, cache_utils
+from app.ml.registry import get_task_assignment_model
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/api/ml/tasks", tags=["Task Assignment"])
 logger = get_logger(__name__)
-model = TaskAssignmentModel()
+model = get_task_assignment_model()
+
+# Retraining happens on the training pipeline's own instance, so the stats of the
+# serving model are fixed for the life of the process.
+MODEL_STATS = {
+    "model_version": model.model_version,
+    "trained": bool(model.clf),
+    "features": model.feature_columns,
+}
+MODEL_STATS_CACHE_TTL = 300
+
+
+class RecommendAssigneeRequest(BaseModel):
+    """Request model for assignee recommendation."""
+
+    task_id: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    required_skills: List[str] = Field(default_factory=list)
+    estimated_hours: Optional[float] = None
+    story_points: Optional[Union[int, float]] = 0
+    complexity: Optional[str] = "medium"
+    team_members: List[Any] = Field(default_factory=list)
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _assignment_cache_key(task: Dict[str, Any], member_ids: List[Any]) -> str:
+    """
+    Build the Redis key for a task assignment recommendation from everything that
+    influences it.
+    """
+    return task_assign_key(
+        _optional_str(task.get("task_id")),
+        _optional_str(task.get("description")),
+        _optional_str(task.get("complexity")),
+        tuple(str(skill) for skill in task.get("required_skills") or []),
+        _optional_float(task.get("estimated_hours")),
+        _optional_float(task.get("estimated_story_points")),
+        tuple(str(member_id) for member_id in member_ids),
+    )
+
+
+# Recommendations are cached for 10 minutes
+ASSIGNMENT_CACHE_TTL = 600
+
+
+async def _cached_recommendations_batch(
+    tasks: List[Dict[str, Any]], team_members_per_task: List[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Look up every (task, team) pair with one MGET, score only the misses in a
+    single batched model call and write them back in one pipeline.
+    """
+    cache_keys = [
+        _assignment_cache_key(task, [m.get("user_id") or m.get("_id") for m in team_members])
+        for task, team_members in zip(tasks, team_members_per_task)
+    ]
+    results = cache_utils.get_many(cache_keys)
+    misses = [i for i, cached in enumerate(results) if not cached]
+    logger.info(f"Task assignment cache: {len(tasks) - len(misses)} hits, {len(misses)} misses")
+
+    if misses:
+        fresh = await run_in_threadpool(
+            model.get_recommendations_batch,
+            [tasks[i] for i in misses],
+            [team_members_per_task[i] for i in misses],
+        )
+        for i, recommendations in zip(misses, fresh):
+            results[i] = recommendations
+        cache_utils.set_many({cache_keys[i]: results[i] for i in misses}, ASSIGNMENT_CACHE_TTL)
+
+    return results
+
+
+# Fields every normalized member carries; dicts that already have them are passed through.
+_REQUIRED_MEMBER_KEYS = frozenset(
+    (
+        "user_id",
+        "_id",
+        "name",
+        "full_name",
+        "skills",
+        "capacity",
+        "current_workload",
+        "velocity",
+        "completion_rate",
+        "time_accuracy",
+        "collaboration_index",
+        "on_time_delivery",
+        "quality_score",
+        "complexity_handled",
+        "completed_similar_tasks",
+        "time_tracking_consistency",
+        "time_logging_variance",
+        "on_vacation",
+    )
+)
 
 
 def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
@@ -30,6 +136,9 @@ def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
         # Already in dict format, but ensure required fields exist
         normalized = []
         for member in team_members:
+            if _REQUIRED_MEMBER_KEYS <= member.keys():
+                normalized.append(member)
+                continue
             normalized_member = {
                 "user_id": member.get("user_id") or member.get("_id") or str(member.get("id", "")),
                 "_id": member.get("_id") or member.get("user_id") or str(member.get("id", "")),
@@ -61,19 +170,19 @@ def _normalize_team_members(team_members: List[Any]) -> List[Dict[str, Any]]:
 @router.post(
     "/recommend-assignee",
     summary="Recommend the best assignee for a task",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
-async def recommend_assignee(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def recommend_assignee(payload: RecommendAssigneeRequest) -> Dict[str, Any]:
     task = {
-        "task_id": payload.get("task_id"),
-        "title": payload.get("title"),
-        "description": payload.get("description"),
-        "required_skills": payload.get("required_skills", []),
-        "estimated_hours": payload.get("estimated_hours"),
-        "estimated_story_points": payload.get("story_points", 0),
-        "complexity": payload.get("complexity", "medium"),
+        "task_id": payload.task_id,
+        "title": payload.title,
+        "description": payload.description,
+        "required_skills": payload.required_skills,
+        "estimated_hours": payload.estimated_hours,
+        "estimated_story_points": payload.story_points or 0,
+        "complexity": payload.complexity,
     }
-    team_members_raw = payload.get("team_members", [])
+    team_members_raw = payload.team_members
 
     if not team_members_raw:
         raise HTTPException(
@@ -90,19 +199,10 @@ async def recommend_assignee(payload: Dict[str, Any]) -> Dict[str, Any]:
             detail="Could not resolve team members. Please provide valid user IDs or developer objects.",
         )
 
-    # Cache the result
-    from app.core.redis_cache import cache_utils
-    import hashlib
-    import json
-    
     # Generate cache key
-    cache_key_data = {
-        'task': task,
-        'team_members': [m.get('user_id') or m.get('_id') for m in team_members],
-    }
-    cache_key_str = json.dumps(cache_key_data, sort_keys=True)
-    cache_key_hash = hashlib.md5(cache_key_str.encode()).hexdigest()
-    cache_key = f"ml:task-assign:{cache_key_hash}"
+    cache_key = _assignment_cache_key(
+        task, [m.get('user_id') or m.get('_id') for m in team_members]
+    )
     
     # Try to get from cache
     cached_result = cache_utils.get(cache_key)
@@ -114,8 +214,7 @@ async def recommend_assignee(payload: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Cache MISS for task assignment: {cache_key}")
     recommendations = model.get_recommendations(task, team_members)
     
-    # Cache for 10 minutes
-    cache_utils.set(cache_key, recommendations, 600)
+    cache_utils.set(cache_key, recommendations, ASSIGNMENT_CACHE_TTL)
     
     return recommendations
 
@@ -123,10 +222,11 @@ async def recommend_assignee(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post(
     "/batch-assign",
     summary="Recommend optimal assignment for multiple tasks",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def batch_assign(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-    assignments = []
+    scored_tasks = []
+    team_members_per_task = []
     for task in tasks:
         team_members_raw = task.get("team_members", [])
         if not team_members_raw:
@@ -134,7 +234,13 @@ async def batch_assign(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         team_members = _normalize_team_members(team_members_raw)
         if not team_members:
             continue
-        recs = model.get_recommendations(task, team_members)
+        scored_tasks.append(task)
+        team_members_per_task.append(team_members)
+
+    batch_recs = await _cached_recommendations_batch(scored_tasks, team_members_per_task)
+
+    assignments = []
+    for task, recs in zip(scored_tasks, batch_recs):
         if recs["recommendations"]:
             assignments.append(
                 {
@@ -148,19 +254,20 @@ async def batch_assign(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
 @router.post(
     "/rebalance-workload",
     summary="Suggest workload rebalancing for the team",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def rebalance_workload(payload: Dict[str, Any]) -> Dict[str, Any]:
     team_members_raw = payload.get("team_members", [])
     tasks = payload.get("tasks", [])
 
     team_members = _normalize_team_members(team_members_raw)
-    
+    if not team_members:
+        return {"suggestions": []}
+
+    batch_recs = await _cached_recommendations_batch(tasks, [team_members] * len(tasks))
+
     suggestions = []
-    for task in tasks:
-        if not team_members:
-            continue
-        recs = model.get_recommendations(task, team_members)
+    for task, recs in zip(tasks, batch_recs):
         if recs["recommendations"]:
             top = recs["recommendations"][0]
             suggestions.append(
@@ -177,7 +284,7 @@ async def rebalance_workload(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post(
     "/feedback",
     summary="Submit feedback on a recommendation",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def submit_feedback(payload: Dict[str, Any]) -> Dict[str, Any]:
     logger.info("Feedback received: %s", payload)
@@ -188,12 +295,9 @@ async def submit_feedback(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.get(
     "/model-stats",
     summary="Get task assignment model statistics",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
-async def model_stats() -> Dict[str, Any]:
-    return {
-        "model_version": model.model_version,
-        "trained": bool(model.clf),
-        "features": model.feature_columns,
-    }
+async def model_stats(response: Response) -> Dict[str, Any]:
+    response.headers["Cache-Control"] = f"public, max-age={MODEL_STATS_CACHE_TTL}"
+    return MODEL_STATS
 
@@ -2,22 +2,36 @@
 Training API Routes
 Endpoints for ML model retraining and performance tracking
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 
-from app.core.security import require_api_key
+from app.core.security import api_key_dependencies
 from app.ml.training_pipeline import training_pipeline
 from app.utils.logger import get_logger
 
 router = APIRouter(
     prefix="/api/ml/training",
     tags=["ML Training"],
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 
 logger = get_logger(__name__)
 
+# Fields of a model metrics document that the performance endpoints return
+METRIC_PROJECTION = {
+    '_id': 1,
+    'version': 1,
+    'accuracy': 1,
+    'precision': 1,
+    'recall': 1,
+    'f1_score': 1,
+    'trained_at': 1,
+    'deployed_at': 1,
+    'training_samples': 1,
+    'improvement': 1,
+}
+
 
 class RetrainRequest(BaseModel):
     """Request model for manual retraining."""
@@ -36,6 +50,20 @@ class RetrainResponse(BaseModel):
     metrics: Optional[Dict] = None
 
 
+def _iso_date(field: str) -> Dict:
+    """
+    Aggregation expression rendering a date field like datetime.isoformat();
+    non-date values pass through unchanged.
+    """
+    return {
+        '$cond': [
+            {'$eq': [{'$type': field}, 'date']},
+            {'$dateToString': {'date': field, 'format': '%Y-%m-%dT%H:%M:%S.%L'}},
+            field,
+        ]
+    }
+
+
 @router.post("/retrain/{model_type}", response_model=RetrainResponse)
 async def trigger_retrain(
     model_type: str, background_tasks: BackgroundTasks, force: bool = False
@@ -62,25 +90,31 @@ async def trigger_retrain(
 
 
 @router.get("/models/performance/{model_type}")
-async def get_model_performance(model_type: str):
+def get_model_performance(model_type: str):
     """
     Get model performance metrics over time.
     """
     try:
+        # Mongo emits JSON-ready documents: string ids and ISO dates
         metrics = list(
-            training_pipeline.metrics_collection.find(
-                {'model_type': model_type}, sort=[('trained_at', -1)], limit=20
+            training_pipeline.metrics_collection.aggregate(
+                [
+                    {'$match': {'model_type': model_type}},
+                    {'$sort': {'trained_at': -1}},
+                    {'$limit': 20},
+                    {'$project': METRIC_PROJECTION},
+                    {
+                        '$addFields': {
+                            '_id': {'$toString': '$_id'},
+                            'trained_at': _iso_date('$trained_at'),
+                            'deployed_at': _iso_date('$deployed_at'),
+                        }
+                    },
+                ],
+                batchSize=20,
             )
         )
 
-        # Convert ObjectId to string for JSON serialization
-        for metric in metrics:
-            metric['_id'] = str(metric['_id'])
-            if isinstance(metric.get('trained_at'), datetime):
-                metric['trained_at'] = metric['trained_at'].isoformat()
-            if isinstance(metric.get('deployed_at'), datetime):
-                metric['deployed_at'] = metric['deployed_at'].isoformat()
-
         return {
             "status": "success",
             "model_type": model_type,
@@ -92,17 +126,27 @@ async def get_model_performance(model_type: str):
 
 
 @router.get("/models/stats")
-async def get_all_models_stats():
+def get_all_models_stats():
     """
     Get current stats for all models.
     """
     try:
-        stats = {}
+        model_types = list(training_pipeline.models.keys())
+        # Latest active metric per model type in a single round-trip
+        latest_metrics = {
+            metric['model_type']: metric
+            for metric in training_pipeline.metrics_collection.aggregate([
+                {'$match': {'model_type': {'$in': model_types}, 'is_active': True}},
+                {'$sort': {'trained_at': -1}},
+                {'$group': {'_id': '$model_type', 'doc': {'$first': '$$ROOT'}}},
+                {'$replaceRoot': {'newRoot': '$doc'}},
+                {'$project': {**METRIC_PROJECTION, 'model_type': 1}},
+            ])
+        }
 
-        for model_type in training_pipeline.models.keys():
-            latest_metric = training_pipeline.metrics_collection.find_one(
-                {'model_type': model_type, 'is_active': True}, sort=[('trained_at', -1)]
-            )
+        stats = {}
+        for model_type in model_types:
+            latest_metric = latest_metrics.get(model_type)
 
             if latest_metric:
                 stats[model_type] = {
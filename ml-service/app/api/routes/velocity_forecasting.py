@@ -1,78 +1,99 @@
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.security import require_api_key
-from app.ml.velocity_forecaster import VelocityForecaster
+from app.core.redis_cache import cache_prediction
+from app.core.security import api_key_dependencies
+from app.ml.registry import get_velocity_forecaster
 from app.utils.logger import get_logger
 
 router = APIRouter(prefix="/api/ml/velocity", tags=["Velocity Forecasting"])
 logger = get_logger(__name__)
-forecaster = VelocityForecaster()
+forecaster = get_velocity_forecaster()
+
+# Modified z-score cutoff (Iglewicz & Hoaglin); 0.6745 scales the MAD to a std dev
+ANOMALY_Z_THRESHOLD = 3.5
+MAD_SCALE = 0.6745
+
+
+@cache_prediction("ml:velocity-predict", 300)
+async def _predict_velocity(team_id: str, capacity: Any) -> Dict[str, Any]:
+    """
+    Velocity forecast shared by /forecast and /predict-completion, so dashboard
+    polling for the same team and capacity reuses one model run.
+    """
+    return await run_in_threadpool(forecaster.predict_velocity, team_id, capacity)
 
 
 @router.post(
     "/forecast",
     summary="Forecast next sprint velocity",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def forecast_velocity(payload: Dict[str, Any]) -> Dict[str, Any]:
     team_id = payload.get("team_id")
     capacity = payload.get("sprint_capacity", 0)
     if not team_id:
         raise HTTPException(status_code=400, detail="team_id is required")
-    return forecaster.predict_velocity(team_id, capacity)
+    return await _predict_velocity(team_id, capacity)
 
 
 @router.post(
     "/predict-completion",
     summary="Estimate completion timeline given remaining work",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def predict_completion(payload: Dict[str, Any]) -> Dict[str, Any]:
     team_id = payload.get("team_id")
     remaining = payload.get("remaining_story_points", 0)
     if not team_id:
         raise HTTPException(status_code=400, detail="team_id is required")
-    forecast = forecaster.predict_velocity(team_id, payload.get("sprint_capacity", 0))
+    forecast = await _predict_velocity(team_id, payload.get("sprint_capacity", 0))
     return forecaster.predict_completion_date(remaining, forecast.get("predicted_velocity", 0))
 
 
 @router.post(
     "/detect-anomalies",
     summary="Detect anomalies in sprint velocities",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
 async def detect_anomalies(payload: Dict[str, Any]) -> Dict[str, Any]:
     velocities = payload.get("velocities", [])
     if len(velocities) < 3:
         return {"anomalies": []}
 
-    mean = sum(velocities) / len(velocities)
-    std_dev = (sum((v - mean) ** 2 for v in velocities) / len(velocities)) ** 0.5
-
-    anomalies = [
-        {"sprint_index": idx, "velocity": velocity}
-        for idx, velocity in enumerate(velocities)
-        if abs(velocity - mean) > 2 * std_dev
-    ]
+    # Median/MAD instead of mean/std, so a large outlier cannot mask itself
+    # by inflating the spread
+    values = np.asarray(velocities, dtype=np.float64)
+    deviations = np.abs(values - np.median(values))
+    mad = np.median(deviations)
+    if mad == 0:
+        outliers = np.flatnonzero(deviations > 0)
+    else:
+        outliers = np.flatnonzero(MAD_SCALE * deviations / mad > ANOMALY_Z_THRESHOLD)
+
+    anomalies = [{"sprint_index": int(idx), "velocity": velocities[idx]} for idx in outliers]
     return {"anomalies": anomalies}
 
 
 @router.get(
     "/trends/{team_id}",
     summary="Return velocity trend classification",
-    dependencies=[Depends(require_api_key)],
+    dependencies=api_key_dependencies,
 )
+@cache_prediction("ml:velocity-trend", 600)
 async def velocity_trend(team_id: str) -> Dict[str, Any]:
-    history = forecaster.load_sprint_history(team_id)
-    velocities = [sprint.get("velocity", 0) for sprint in history]
-
-    if len(velocities) < 2:
+    history = await run_in_threadpool(forecaster.load_sprint_history, team_id)
+    if len(history) < 2:
         return {"trend": "insufficient_data"}
 
-    trend = "increasing" if velocities[-1] > velocities[0] else "decreasing"
-    if abs(velocities[-1] - velocities[0]) < 3:
+    # Only the first and last sprint decide the trend
+    first = history[0].get("velocity", 0)
+    last = history[-1].get("velocity", 0)
+    trend = "increasing" if last > first else "decreasing"
+    if abs(last - first) < 3:
         trend = "stable"
 
     return {"trend": trend}
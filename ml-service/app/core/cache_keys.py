@@ -0,0 +1,53 @@
+"""
+Redis cache key builders for ML predictions.
+Functions here take plain typed arguments and touch no request objects, so the
+module can be compiled with mypyc (`mypyc app/core/cache_keys.py`) as-is.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Parameterized once; each key hashes on a cheap copy instead of a fresh hasher.
+_KEY_HASHER = hashlib.blake2b(digest_size=16)
+
+
+def _digest(text: str) -> str:
+    hasher = _KEY_HASHER.copy()
+    hasher.update(text.encode())
+    return hasher.hexdigest()
+
+
+def task_assign_key(
+    task_id: Optional[str],
+    description: Optional[str],
+    complexity: Optional[str],
+    skills: Tuple[str, ...],
+    estimated_hours: Optional[float],
+    story_points: Optional[float],
+    member_ids: Tuple[str, ...],
+) -> str:
+    """
+    Key for a task assignment recommendation. Skills and member ids are sorted so
+    the key does not depend on their order.
+    """
+    canonical = (
+        task_id,
+        description,
+        complexity,
+        tuple(sorted(skills)),
+        estimated_hours,
+        story_points,
+        tuple(sorted(member_ids)),
+    )
+    return "ml:task-assign:" + _digest(repr(canonical))
+
+
+def risk_alerts_key(team_id: str, threshold: int) -> str:
+    """Key for the high-severity risk alerts of a team."""
+    return f"ml:risk-alerts:{team_id}:{threshold}"
+
+
+@lru_cache(maxsize=1024)
+def prediction_key(key_prefix: str, args: str, kwargs: str) -> str:
+    """Key for a cache_prediction-decorated call, from the reprs of its arguments."""
+    return f"{key_prefix}:{_digest(args + '|' + kwargs)}"
@@ -1,7 +1,7 @@
 """
 Application configuration and settings management.
 """
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import List, Optional
 
 from pydantic import Field
@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     api_key: str = Field("your_ml_api_key_here", alias="API_KEY")
     mongodb_uri: str = Field("mongodb://localhost:27017/agilesafe", alias="MONGODB_URI")
     mongodb_db: str = Field("agilesafe", alias="MONGODB_DB")
+    mongodb_max_pool_size: int = Field(50, alias="MONGODB_MAX_POOL_SIZE")
+    mongodb_min_pool_size: int = Field(5, alias="MONGODB_MIN_POOL_SIZE")
     
     @property
     def MONGODB_URI(self) -> str:
@@ -35,6 +37,8 @@ class Settings(BaseSettings):
     allowed_origins: str = Field("http://localhost:5173", alias="ALLOWED_ORIGINS")
     training_batch_size: int = Field(64, alias="TRAINING_BATCH_SIZE")
     training_epochs: int = Field(10, alias="TRAINING_EPOCHS")
+    embedding_workers: int = Field(0, alias="EMBEDDING_WORKERS")
+    preload_models: bool = Field(False, alias="PRELOAD_MODELS")
     vite_ws_url: Optional[str] = Field("http://localhost:5000", alias="VITE_WS_URL")
 
     model_config = {
@@ -43,10 +47,11 @@ class Settings(BaseSettings):
         "protected_namespaces": ("settings_",),
     }
 
-    @property
+    @cached_property
     def allowed_origins_list(self) -> List[str]:
         """
         Helper property that returns the configured CORS origins as a list.
+        Parsed once; settings is a process-wide singleton.
         """
         return [origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()]
 
@@ -1,7 +1,11 @@
 """
 MongoDB connection management.
 """
-from typing import Any, Dict, List, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
@@ -15,6 +19,52 @@ logger = get_logger(__name__)
 _client: Optional[MongoClient] = None
 _database: Optional[Database] = None
 
+# Developer documents are requested many times a minute for the same team, so
+# converted users are kept in a small in-process TTL LRU cache keyed by user id.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_SIZE = 4096
+_user_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# Lookups run on threadpool workers, so every read and write of the cache holds this
+_user_cache_lock = threading.Lock()
+
+# Hex form of an ObjectId; checked up front instead of catching ObjectId's error
+_OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+# User document fields read by _user_to_developer, in both camelCase and snake_case
+USER_PROJECTION = {
+    field: 1
+    for field in (
+        "name",
+        "fullName",
+        "skills",
+        "capacity",
+        "availability",
+        "currentWorkload",
+        "current_workload",
+        "velocity",
+        "completionRate",
+        "completion_rate",
+        "onTimeDelivery",
+        "on_time_delivery",
+        "qualityScore",
+        "quality_score",
+        "timeAccuracy",
+        "time_accuracy",
+        "collaborationIndex",
+        "collaboration_index",
+        "complexityHandled",
+        "complexity_handled",
+        "completedSimilarTasks",
+        "completed_similar_tasks",
+        "timeTrackingConsistency",
+        "time_tracking_consistency",
+        "timeLoggingVariance",
+        "time_logging_variance",
+        "onVacation",
+        "on_vacation",
+    )
+}
+
 
 async def connect_to_mongo() -> None:
     """
@@ -26,7 +76,17 @@ async def connect_to_mongo() -> None:
         return
 
     logger.info("Connecting to MongoDB at %s", settings.mongodb_uri)
-    _client = MongoClient(settings.mongodb_uri)
+    _client = MongoClient(
+        settings.mongodb_uri,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxIdleTimeMS=60000,
+        serverSelectionTimeoutMS=5000,
+        waitQueueTimeoutMS=10000,
+        retryWrites=True,
+        # zlib ships with Python; zstd/snappy would need extra client packages
+        compressors="zlib",
+    )
 
     default_db = _client.get_default_database()
     if default_db is not None:
@@ -49,6 +109,13 @@ async def close_mongo_connection() -> None:
         _client = None
 
 
+def ping_database() -> None:
+    """
+    Round-trip a ping so the client's connection pool is open before traffic arrives.
+    """
+    get_database().command("ping")
+
+
 def get_database() -> Database:
     if _database is None:
         raise RuntimeError("Database connection has not been initialized.")
@@ -67,112 +134,147 @@ def fetch_training_data(
     """
     Convenience helper to fetch training samples from MongoDB.
     """
-    cursor = get_collection(collection).find(query or {}).limit(limit)
+    # One batch per server reply instead of the driver's default 101 documents
+    cursor = get_collection(collection).find(query or {}).limit(limit).batch_size(min(limit, 1000))
     return list(cursor)
 
 
+def _get_cached_user(user_id: str) -> Optional[Dict[str, Any]]:
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
+            return None
+        expires_at, developer = entry
+        if expires_at < time.monotonic():
+            del _user_cache[user_id]
+            return None
+        _user_cache.move_to_end(user_id)
+    return dict(developer)
+
+
+def _cache_user(user_id: str, developer: Dict[str, Any]) -> None:
+    entry = (time.monotonic() + USER_CACHE_TTL_SECONDS, dict(developer))
+    with _user_cache_lock:
+        _user_cache[user_id] = entry
+        _user_cache.move_to_end(user_id)
+        while len(_user_cache) > USER_CACHE_MAX_SIZE:
+            _user_cache.popitem(last=False)
+
+
+# (developer field, camelCase user field, snake_case user field, default) for the
+# metrics that are copied over as stored
+_PASSTHROUGH_FIELDS = (
+    ("collaboration_index", "collaborationIndex", "collaboration_index", 0.5),
+    ("complexity_handled", "complexityHandled", "complexity_handled", "medium"),
+    ("completed_similar_tasks", "completedSimilarTasks", "completed_similar_tasks", 0),
+    ("time_tracking_consistency", "timeTrackingConsistency", "time_tracking_consistency", 0.5),
+    ("time_logging_variance", "timeLoggingVariance", "time_logging_variance", 0.3),
+    ("on_vacation", "onVacation", "on_vacation", False),
+)
+
+
+def _ratio(value: Any, default: float) -> float:
+    """
+    Stored metric as a 0-1 ratio; values above 1 are percentages.
+    """
+    if value is None:
+        return default
+    return value / 100 if value > 1 else value
+
+
+def _user_to_developer(user: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """
+    Convert a user document to the developer dictionary the ML models consume.
+    """
+    get = user.get
+
+    # Convert user to developer format - only use actual data from database
+    # Use 'availability' as capacity (from User model), or 'capacity' if it exists
+    # Default to 40 story points if neither is set
+    capacity = get("capacity") or get("availability") or 40
+
+    # Always proceed, but use default capacity if missing
+    if capacity <= 0:
+        capacity = 40
+        logger.info("User %s missing capacity, using default 40 story points", user_id)
+
+    # Get stored metrics (use stored values if available)
+    current_workload = get("currentWorkload") or get("current_workload")
+    velocity = get("velocity")
+    document_id = str(get("_id", user_id))
+    name = get("name") or get("fullName") or "Unknown"
+
+    developer = {
+        "user_id": document_id,
+        "_id": document_id,
+        "name": name,
+        "full_name": name,
+        "skills": get("skills", []),
+        "capacity": capacity,
+        "current_workload": 0 if current_workload is None else current_workload,
+        "velocity": 0.0 if velocity is None else velocity,
+        # Stored ratios, converted to 0-1
+        "completion_rate": _ratio(get("completionRate") or get("completion_rate"), 0.5),
+        "time_accuracy": _ratio(get("timeAccuracy") or get("time_accuracy"), 0.5),
+        "on_time_delivery": _ratio(get("onTimeDelivery") or get("on_time_delivery"), 0.5),
+        "quality_score": _ratio(get("qualityScore") or get("quality_score"), 0.5),
+    }
+    for field, camel_key, snake_key, default in _PASSTHROUGH_FIELDS:
+        developer[field] = get(camel_key) or get(snake_key) or default
+    return developer
+
+
 def fetch_users_by_ids(user_ids: List[str]) -> List[Dict[str, Any]]:
     """
     Fetch user documents from MongoDB by their IDs.
     Converts user IDs to developer dictionaries with required fields.
+    Recently fetched users are served from an in-process cache; the rest are
+    loaded with a single $in query and returned in the order requested.
     """
     from bson import ObjectId
     
     if not user_ids:
         return []
     
-    users_collection = get_collection("users")
-    developers = []
-    
+    developers_by_id: Dict[str, Dict[str, Any]] = {}
+    # Ids that are valid ObjectId strings are queried as ObjectIds, the rest as strings
+    lookup_keys: Dict[str, Any] = {}
     for user_id in user_ids:
+        if user_id in developers_by_id or user_id in lookup_keys:
+            continue
+        cached = _get_cached_user(user_id)
+        if cached is not None:
+            developers_by_id[user_id] = cached
+            continue
+        if isinstance(user_id, str) and _OBJECT_ID_RE.fullmatch(user_id):
+            lookup_keys[user_id] = ObjectId(user_id)
+        else:
+            lookup_keys[user_id] = user_id
+
+    if lookup_keys:
         try:
-            # Try ObjectId if it's a valid ObjectId string
-            try:
-                query = {"_id": ObjectId(user_id)}
-            except Exception:
-                # If not ObjectId, try as string
-                query = {"_id": user_id}
-            
-            user = users_collection.find_one(query)
-            
-            if user:
-                # Convert user to developer format - only use actual data from database
-                # Use 'availability' as capacity (from User model), or 'capacity' if it exists
-                # Default to 40 story points if neither is set
-                capacity = user.get("capacity") or user.get("availability") or 40
-                
-                # Always proceed, but use default capacity if missing
-                if capacity is None or capacity <= 0:
-                    capacity = 40
-                    logger.info("User %s missing capacity, using default 40 story points", user_id)
-                
-                # Get stored metrics (use stored values if available, otherwise calculate)
-                current_workload = user.get("currentWorkload") or user.get("current_workload")
-                if current_workload is None:
-                    # Fallback: calculate from incomplete tasks (but prefer stored value)
-                    current_workload = 0
-                
-                velocity = user.get("velocity")
-                if velocity is None:
-                    velocity = 0.0
-                
-                completion_rate = user.get("completionRate") or user.get("completion_rate")
-                if completion_rate is None:
-                    completion_rate = 0.5
-                else:
-                    # Convert percentage to decimal (0-1)
-                    completion_rate = completion_rate / 100 if completion_rate > 1 else completion_rate
-                
-                on_time_delivery = user.get("onTimeDelivery") or user.get("on_time_delivery")
-                if on_time_delivery is None:
-                    on_time_delivery = 0.5
-                else:
-                    # Convert percentage to decimal (0-1)
-                    on_time_delivery = on_time_delivery / 100 if on_time_delivery > 1 else on_time_delivery
-                
-                quality_score = user.get("qualityScore") or user.get("quality_score")
-                if quality_score is None:
-                    quality_score = 0.5
-                else:
-                    # Convert percentage to decimal (0-1)
-                    quality_score = quality_score / 100 if quality_score > 1 else quality_score
-                
-                time_accuracy = user.get("timeAccuracy") or user.get("time_accuracy")
-                if time_accuracy is None:
-                    time_accuracy = 0.5
-                else:
-                    # Convert percentage to decimal (0-1)
-                    time_accuracy = time_accuracy / 100 if time_accuracy > 1 else time_accuracy
-                
-                developer = {
-                    "user_id": str(user.get("_id", user_id)),
-                    "_id": str(user.get("_id", user_id)),
-                    "name": user.get("name") or user.get("fullName") or "Unknown",
-                    "full_name": user.get("name") or user.get("fullName") or "Unknown",
-                    "skills": user.get("skills", []),
-                    "capacity": capacity,
-                    "current_workload": current_workload,  # Use stored value
-                    "velocity": velocity,  # Use stored value
-                    "completion_rate": completion_rate,  # Use stored value (converted to 0-1)
-                    "time_accuracy": time_accuracy,  # Use stored value (converted to 0-1)
-                    "collaboration_index": user.get("collaborationIndex") or user.get("collaboration_index") or 0.5,
-                    "on_time_delivery": on_time_delivery,  # Use stored value (converted to 0-1)
-                    "quality_score": quality_score,  # Use stored value (converted to 0-1)
-                    "complexity_handled": user.get("complexityHandled") or user.get("complexity_handled") or "medium",
-                    "completed_similar_tasks": user.get("completedSimilarTasks") or user.get("completed_similar_tasks") or 0,
-                    "time_tracking_consistency": user.get("timeTrackingConsistency") or user.get("time_tracking_consistency") or 0.5,
-                    "time_logging_variance": user.get("timeLoggingVariance") or user.get("time_logging_variance") or 0.3,
-                    "on_vacation": user.get("onVacation") or user.get("on_vacation") or False,
-                }
-                developers.append(developer)
-            else:
-                # User not found - skip (don't create dummy data)
-                logger.warning("User %s not found in database, skipping", user_id)
+            cursor = get_collection("users").find(
+                {"_id": {"$in": list(lookup_keys.values())}}, projection=USER_PROJECTION
+            )
+            users_by_key = {user["_id"]: user for user in cursor}
         except Exception as e:
-            logger.warning("Error fetching user %s: %s, skipping", user_id, e)
+            logger.warning("Error fetching users %s: %s, skipping", list(lookup_keys), e)
             # Don't create dummy data on error
-    
-    return developers
-
+            users_by_key = {}
 
+        for user_id, key in lookup_keys.items():
+            user = users_by_key.get(key)
+            if not user:
+                # User not found - skip (don't create dummy data)
+                logger.warning("User %s not found in database, skipping", user_id)
+                continue
+            try:
+                developer = _user_to_developer(user, user_id)
+            except Exception as e:
+                logger.warning("Error converting user %s: %s, skipping", user_id, e)
+                continue
+            developers_by_id[user_id] = developer
+            _cache_user(user_id, developer)
 
+    # Each caller gets its own copy, in request order
+    return [dict(developers_by_id[user_id]) for user_id in user_ids if user_id in developers_by_id]
@@ -4,26 +4,34 @@ Provides caching decorators and utilities for ML predictions
 """
 import redis
 import json
-import hashlib
+import zlib
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 import os
+from app.core.cache_keys import prediction_key
 from app.core.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Redis connection pool, shared by every client in the process
+redis_pool = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379)),
+    password=os.getenv('REDIS_PASSWORD'),
+    db=0,
+    # Values are bytes: JSON, zlib-compressed above COMPRESS_MIN_BYTES
+    decode_responses=False,
+    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 64)),
+    socket_connect_timeout=5,
+    socket_timeout=5,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+
 # Redis client
 try:
-    redis_client = redis.Redis(
-        host=os.getenv('REDIS_HOST', 'localhost'),
-        port=int(os.getenv('REDIS_PORT', 6379)),
-        password=os.getenv('REDIS_PASSWORD'),
-        db=0,
-        decode_responses=True,
-        socket_connect_timeout=5,
-        socket_timeout=5,
-    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     # Test connection
     redis_client.ping()
     logger.info("✓ Redis connected for ML service")
@@ -32,6 +40,25 @@ except Exception as e:
     redis_client = None
 
 
+# Serialized payloads at least this large are stored zlib-compressed
+COMPRESS_MIN_BYTES = 1024
+# JSON never starts with this byte, so it marks compressed payloads unambiguously
+_COMPRESSED_PREFIX = b"z"
+
+
+def _serialize(value: Any) -> bytes:
+    data = json.dumps(value, default=str).encode()
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _COMPRESSED_PREFIX + zlib.compress(data, 1)
+    return data
+
+
+def _deserialize(data: bytes) -> Any:
+    if data.startswith(_COMPRESSED_PREFIX):
+        data = zlib.decompress(data[len(_COMPRESSED_PREFIX):])
+    return json.loads(data)
+
+
 def cache_prediction(key_prefix: str, ttl: int = 300):
     """
     Decorator to cache ML predictions.
@@ -44,58 +71,56 @@ def cache_prediction(key_prefix: str, ttl: int = 300):
     """
 
     def decorator(func: Callable) -> Callable:
+        # redis_client is fixed at import; without Redis there is nothing to wrap
+        if not redis_client:
+            return func
+
+        # Bind module globals as closure locals for the per-call path
+        client = redis_client
+        build_key = prediction_key
+        serialize = _serialize
+        deserialize = _deserialize
+        log = logger
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            if not redis_client:
-                # Redis not available, skip caching
-                return await func(*args, **kwargs)
-
             # Generate cache key from function arguments
             try:
-                args_str = json.dumps(
-                    {
-                        'args': str(args),
-                        'kwargs': {k: str(v) for k, v in kwargs.items()},
-                    },
-                    sort_keys=True,
-                )
-
-                # Hash for shorter key
-                args_hash = hashlib.md5(args_str.encode()).hexdigest()
-                cache_key = f"{key_prefix}:{args_hash}"
-
-                # Try to get from cache
-                try:
-                    cached = redis_client.get(cache_key)
-                    if cached:
-                        logger.debug(f"Cache HIT: {cache_key}")
-                        return json.loads(cached)
-                except Exception as e:
-                    logger.warning(f"Cache get error: {e}")
-
-                # Cache miss - call function
-                logger.debug(f"Cache MISS: {cache_key}")
-                result = await func(*args, **kwargs)
-
-                # Store in cache
-                try:
-                    redis_client.setex(
-                        cache_key, ttl, json.dumps(result, default=str)
-                    )
-                except Exception as e:
-                    logger.warning(f"Cache set error: {e}")
-
-                return result
+                cache_key = build_key(key_prefix, repr(args), repr(sorted(kwargs.items())))
             except Exception as e:
-                logger.error(f"Cache decorator error: {e}")
+                log.error(f"Cache decorator error: {e}")
                 # Fallback to function call
                 return await func(*args, **kwargs)
 
+            # Try to get from cache
+            try:
+                cached = client.get(cache_key)
+                if cached is not None:
+                    log.debug("Cache HIT: %s", cache_key)
+                    return deserialize(cached)
+            except Exception as e:
+                log.warning(f"Cache get error: {e}")
+
+            # Cache miss - call function
+            log.debug("Cache MISS: %s", cache_key)
+            result = await func(*args, **kwargs)
+
+            # Store in cache
+            try:
+                client.setex(cache_key, ttl, serialize(result))
+            except Exception as e:
+                log.warning(f"Cache set error: {e}")
+
+            return result
+
         return wrapper
 
     return decorator
 
 
+INVALIDATE_BATCH_SIZE = 500
+
+
 def invalidate_cache_pattern(pattern: str) -> int:
     """
     Invalidate all cache keys matching pattern.
@@ -110,11 +135,23 @@ def invalidate_cache_pattern(pattern: str) -> int:
         return 0
 
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} cache keys matching: {pattern}")
-        return len(keys)
+        # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+        deleted = 0
+        pipe = redis_client.pipeline(transaction=False)
+        batch = []
+        for key in redis_client.scan_iter(match=pattern, count=INVALIDATE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == INVALIDATE_BATCH_SIZE:
+                pipe.delete(*batch)
+                deleted += len(batch)
+                batch = []
+        if batch:
+            pipe.delete(*batch)
+            deleted += len(batch)
+        if deleted:
+            pipe.execute()
+            logger.info(f"Invalidated {deleted} cache keys matching: {pattern}")
+        return deleted
     except Exception as e:
         logger.error(f"Cache invalidation error: {e}")
         return 0
@@ -132,7 +169,7 @@ class CacheUtils:
 
         try:
             data = redis_client.get(key)
-            return json.loads(data) if data else None
+            return _deserialize(data) if data else None
         except Exception as e:
             logger.warning(f"Cache get error for {key}: {e}")
             return None
@@ -144,12 +181,40 @@ class CacheUtils:
             return False
 
         try:
-            redis_client.setex(key, ttl, json.dumps(value, default=str))
+            redis_client.setex(key, ttl, _serialize(value))
             return True
         except Exception as e:
             logger.warning(f"Cache set error for {key}: {e}")
             return False
 
+    @staticmethod
+    def get_many(keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one MGET round-trip; misses come back as None."""
+        if not redis_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            return [_deserialize(data) if data else None for data in redis_client.mget(keys)]
+        except Exception as e:
+            logger.warning(f"Cache mget error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+    @staticmethod
+    def set_many(items: Dict[str, Any], ttl: int = 300) -> bool:
+        """Set several values with the same TTL in one pipelined round-trip."""
+        if not redis_client or not items:
+            return False
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, _serialize(value))
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache mset error for {len(items)} keys: {e}")
+            return False
+
     @staticmethod
     def delete(key: str) -> bool:
         """Delete key from cache."""
@@ -1,7 +1,10 @@
 """
 Security helpers (API key authentication).
 """
-from fastapi import Security
+from typing import List
+
+from fastapi import Depends, Security
+from fastapi.params import Depends as DependsParam
 from fastapi.security.api_key import APIKeyHeader
 
 from app.core.config import settings
@@ -16,4 +19,8 @@ async def require_api_key(api_key: str = Security(api_key_header)) -> str:
     return api_key or ""
 
 
-
+# require_api_key accepts every request, so outside production it is left off the
+# routes entirely and FastAPI has no dependency to resolve per request.
+api_key_dependencies: List[DependsParam] = (
+    [Depends(require_api_key)] if settings.env == "production" else []
+)
@@ -2,11 +2,17 @@
 Advanced Feature NLP Analyzer
 Uses spaCy and transformers for deep text analysis of feature descriptions
 """
+import copy
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 try:
     import spacy
+    from spacy.matcher import Matcher, PhraseMatcher
     from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
     import torch
     SPACY_AVAILABLE = True
@@ -16,10 +22,128 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     logging.warning("spaCy or transformers not available. NLP features will be limited.")
 
+try:
+    import pysbd
+    PYSBD_AVAILABLE = True
+except ImportError:
+    PYSBD_AVAILABLE = False
+
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Texts per forward pass for the zero-shot classifier and per spaCy pipe batch
+CLASSIFIER_BATCH_SIZE = 32
+SPACY_BATCH_SIZE = 64
+
+# Lemmas are never read. The tagger, attribute_ruler (which maps tags to pos_),
+# parser (noun_chunks, sents) and ner (ents) all feed the analysis.
+SPACY_DISABLED_COMPONENTS = ["lemmatizer"]
+
+# Keyword intent scores decisive enough to skip the zero-shot classifier
+INTENT_HEURISTIC_MIN_SCORE = 0.8
+INTENT_HEURISTIC_MIN_MARGIN = 0.4
+
+# Analyses kept per process, keyed by a hash of the combined feature text
+ANALYSIS_CACHE_SIZE = 4096
+
+# Keywords per intent for the keyword-based fallback classification
+INTENT_KEYWORDS = {
+    "Authentication": frozenset({"login", "auth", "password", "token", "session"}),
+    "User Management": frozenset({"user", "profile", "account", "member"}),
+    "CRUD Operations": frozenset({"create", "read", "update", "delete", "manage"}),
+    "Payment Processing": frozenset({"payment", "stripe", "paypal", "billing", "invoice"}),
+    "Email Notifications": frozenset({"email", "send", "notify", "mail"}),
+    "File Management": frozenset({"file", "upload", "download", "document"}),
+    "Reporting": frozenset({"report", "analytics", "dashboard", "metrics"}),
+    "API Integration": frozenset({"api", "integrate", "webhook", "endpoint"}),
+    "Data Analytics": frozenset({"analytics", "data", "statistics", "insights"}),
+    "Search": frozenset({"search", "find", "filter", "query"}),
+}
+
+# Third-party service keyword -> purpose
+INTEGRATION_KEYWORDS = {
+    "sendgrid": "Email service",
+    "stripe": "Payment processing",
+    "twilio": "SMS service",
+    "aws s3": "File storage",
+    "google maps": "Location service",
+    "firebase": "Backend service",
+    "slack": "Communication",
+    "github": "Version control",
+    "jira": "Project management",
+    "aws": "Cloud services",
+    "azure": "Cloud services",
+    "mongodb": "Database",
+    "redis": "Cache",
+}
+
+SECURITY_KEYWORDS = ("auth", "login", "secure", "encrypt", "password")
+FALLBACK_SECURITY_KEYWORDS = ("auth", "login", "secure")
+REALTIME_KEYWORDS = ("real-time", "live", "instant", "websocket", "socket")
+
+# Exact-match vocabularies for spaCy tokens and entities
+TECH_KEYWORDS = frozenset({
+    "react", "node", "mongodb", "jwt", "api", "rest", "graphql", "redis", "aws",
+    "azure", "docker", "kubernetes", "postgresql", "mysql", "firebase", "sendgrid",
+    "stripe", "javascript", "typescript", "python", "java", "spring", "express",
+})
+ROLE_ENTITY_KEYWORDS = frozenset({"user", "admin", "customer", "manager"})
+ACTION_VERBS = frozenset({
+    "create", "read", "update", "delete", "login", "register", "upload", "download",
+    "send", "receive", "notify", "manage", "authenticate", "authorize", "validate",
+    "process", "search", "filter", "export", "import",
+})
+CRUD_ACTIONS = frozenset({"create", "read", "update", "delete"})
+PERSONA_KEYWORDS = frozenset({
+    "user", "admin", "administrator", "customer", "manager", "developer", "team member",
+    "stakeholder", "visitor", "guest", "subscriber", "member", "owner", "moderator",
+})
+
+# Substring vocabularies for the fallbacks; order decides the output order
+FALLBACK_TECH_KEYWORDS = (
+    "react", "node", "mongodb", "jwt", "api", "rest", "graphql", "redis", "aws",
+    "azure", "docker", "kubernetes",
+)
+FALLBACK_ROLE_KEYWORDS = ("user", "admin", "customer", "manager", "developer")
+FALLBACK_ACTION_KEYWORDS = (
+    "create", "read", "update", "delete", "login", "register", "upload", "download",
+)
+FALLBACK_PERSONA_KEYWORDS = ("user", "admin", "customer", "manager", "developer", "visitor", "guest")
+
+# Sentence patterns marking functional and non-functional requirements
+FUNCTIONAL_PATTERNS = (
+    "user can", "system should", "must allow", "able to", "functionality to",
+    "feature to", "capability to", "should be able",
+)
+NFR_PATTERNS = (
+    "secure", "fast", "scalable", "reliable", "available", "performance", "security",
+    "usability", "maintainability", "responsive",
+)
+FALLBACK_FUNCTIONAL_PATTERNS = ("user can", "system should", "must allow", "able to")
+FALLBACK_NFR_PATTERNS = ("secure", "fast", "scalable", "reliable")
+
+STORY_COMPLEXITY_KEYWORDS = ("integrate", "complex", "multiple", "secure", "real-time")
+
+# Every keyword the substring-based checks look for; each feature is scanned
+# for all of them once and the hits are shared by those checks.
+SCAN_KEYWORDS = frozenset(
+    [keyword for keywords in INTENT_KEYWORDS.values() for keyword in keywords]
+    + list(INTEGRATION_KEYWORDS)
+    + list(SECURITY_KEYWORDS)
+    + list(FALLBACK_SECURITY_KEYWORDS)
+    + list(REALTIME_KEYWORDS)
+    + list(FALLBACK_TECH_KEYWORDS)
+    + list(FALLBACK_ROLE_KEYWORDS)
+    + list(FALLBACK_ACTION_KEYWORDS)
+    + list(FALLBACK_PERSONA_KEYWORDS)
+)
+
+
+def _scan_keywords(text_lower: str) -> frozenset:
+    """Return the SCAN_KEYWORDS that occur as substrings of ``text_lower``."""
+    return frozenset(keyword for keyword in SCAN_KEYWORDS if keyword in text_lower)
+
 
 class AdvancedFeatureNLP:
     """
@@ -43,35 +167,76 @@ class AdvancedFeatureNLP:
             "Data Analytics",
             "Search",
         ]
+        self._analysis_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        # Features classified so far, and how many of them the keyword cascade settled
+        self._intents_classified = 0
+        self._intents_by_heuristic = 0
+        # Rule-based sentence splitter for the spaCy-free path; handles "e.g.", "U.S.", decimals
+        self._sentence_segmenter = pysbd.Segmenter(language="en", clean=False) if PYSBD_AVAILABLE else None
 
         # Try to load spaCy
         if SPACY_AVAILABLE:
             try:
-                self.nlp = spacy.load("en_core_web_lg")
+                self.nlp = spacy.load("en_core_web_lg", disable=SPACY_DISABLED_COMPONENTS)
                 logger.info("Loaded spaCy model: en_core_web_lg")
             except OSError:
                 try:
-                    self.nlp = spacy.load("en_core_web_sm")
+                    self.nlp = spacy.load("en_core_web_sm", disable=SPACY_DISABLED_COMPONENTS)
                     logger.warning("Loaded smaller spaCy model: en_core_web_sm")
                 except OSError:
                     logger.warning("spaCy model not found. Using fallback NLP.")
                     self.nlp = None
 
+            if self.nlp:
+                self._build_matchers()
+
         # Try to load transformer classifier
         if TRANSFORMERS_AVAILABLE:
             try:
+                use_gpu = torch.cuda.is_available()
                 self.classifier = pipeline(
                     "zero-shot-classification",
                     model="facebook/bart-large-mnli",
-                    device=0 if torch.cuda.is_available() else -1,
+                    device=0 if use_gpu else -1,
+                    # Half precision halves weight traffic on GPU; CPU kernels need fp32
+                    torch_dtype=torch.float16 if use_gpu else torch.float32,
                 )
+                if not use_gpu:
+                    self._quantize_classifier()
                 logger.info("Loaded transformer classifier: facebook/bart-large-mnli")
             except Exception as e:
                 logger.warning(f"Failed to load transformer classifier: {e}")
                 self.classifier = None
 
+    def _build_matchers(self) -> None:
+        """Compile the token vocabularies into spaCy matchers that run in Cython."""
+        self._action_matcher = Matcher(self.nlp.vocab)
+        self._action_matcher.add("ACTION", [[{"POS": "VERB", "LOWER": {"IN": sorted(ACTION_VERBS)}}]])
+
+        # A token can only equal a single-word persona
+        self._persona_matcher = Matcher(self.nlp.vocab)
+        self._persona_matcher.add(
+            "PERSONA", [[{"LOWER": {"IN": sorted(k for k in PERSONA_KEYWORDS if " " not in k)}}]]
+        )
+
+        # Match labels double as the requirement buckets
+        self._requirement_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self._requirement_matcher.add("functional", [self.nlp.make_doc(p) for p in FUNCTIONAL_PATTERNS])
+        self._requirement_matcher.add("non_functional", [self.nlp.make_doc(p) for p in NFR_PATTERNS])
+
+    def _quantize_classifier(self) -> None:
+        """Swap the classifier's Linear layers for dynamic int8 versions on CPU."""
+        try:
+            self.classifier.model = torch.quantization.quantize_dynamic(
+                self.classifier.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("Quantized transformer classifier to int8 for CPU inference")
+        except Exception as e:
+            logger.warning(f"Int8 quantization failed, keeping fp32 classifier: {e}")
+
     def analyze_feature(
-        self, title: str, description: str, business_value: str = ""
+        self, title: str, description: str, business_value: str = "", force: bool = False
     ) -> Dict:
         """
         Perform comprehensive NLP analysis on feature.
@@ -80,36 +245,91 @@ class AdvancedFeatureNLP:
             title: Feature title
             description: Feature description
             business_value: Business value description
+            force: Recompute even if the same text was analyzed before
 
         Returns:
             Dictionary with analysis results
         """
-        # Combine all text
-        full_text = f"{title}. {description}. {business_value}"
+        return self.analyze_features_batch([(title, description, business_value)], force=force)[0]
 
+    def analyze_features_batch(
+        self, features: List[Tuple[str, str, str]], force: bool = False
+    ) -> List[Dict]:
+        """
+        Analyze several features at once. spaCy parses them through nlp.pipe and the
+        intent classifier scores them in batched forward passes. Analyses are cached
+        by content, so duplicate features are only analyzed once.
+
+        Args:
+            features: (title, description, business_value) tuples
+            force: Recompute every feature instead of using cached analyses
+
+        Returns:
+            One analysis dictionary per feature, in input order
+        """
+        # Combine all text
+        full_texts = [
+            f"{title}. {description}. {business_value}" for title, description, business_value in features
+        ]
+        keys = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in full_texts]
+
+        results: Dict[bytes, Dict] = {}
+        if not force:
+            with self._analysis_cache_lock:
+                for key in keys:
+                    if key in self._analysis_cache:
+                        self._analysis_cache.move_to_end(key)
+                        results[key] = self._analysis_cache[key]
+
+        # Analyze each distinct uncached text once
+        pending = {key: text for key, text in zip(keys, full_texts) if key not in results}
+        if pending:
+            fresh = dict(zip(pending, self._analyze_texts(list(pending.values()))))
+            results.update(fresh)
+            with self._analysis_cache_lock:
+                for key, analysis in fresh.items():
+                    self._analysis_cache[key] = analysis
+                    self._analysis_cache.move_to_end(key)
+                while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+
+        # Callers may mutate what they get back; the cached analyses must stay intact
+        return [copy.deepcopy(results[key]) for key in keys]
+
+    def _analyze_texts(self, full_texts: List[str]) -> List[Dict]:
+        """Analyze combined feature texts without consulting the cache."""
         # Process with spaCy if available
         if self.nlp:
-            doc = self.nlp(full_text)
+            docs = list(self.nlp.pipe(full_texts, batch_size=SPACY_BATCH_SIZE))
         else:
-            doc = None
+            docs = [None] * len(full_texts)
 
-        # Extract entities
-        entities = self._extract_entities(doc, full_text) if doc else self._extract_entities_fallback(full_text)
+        keyword_hits = [_scan_keywords(full_text.lower()) for full_text in full_texts]
 
         # Classify intents
-        intents = self._classify_intents(full_text)
+        intents = self._classify_intents(full_texts, keyword_hits)
+
+        return [
+            self._analyze_text(full_text, doc, intent, hits)
+            for full_text, doc, intent, hits in zip(full_texts, docs, intents, keyword_hits)
+        ]
+
+    def _analyze_text(self, full_text: str, doc, intents: Dict, keyword_hits: frozenset) -> Dict:
+        """Assemble the analysis of one feature from its parse, intents and keyword hits."""
+        # Extract entities
+        entities = self._extract_entities(doc) if doc else self._extract_entities_fallback(keyword_hits)
 
         # Extract requirements
-        requirements = self._extract_requirements(doc, full_text) if doc else self._extract_requirements_fallback(full_text)
+        requirements = self._extract_requirements(doc) if doc else self._extract_requirements_fallback(full_text)
 
         # Identify user personas
-        personas = self._identify_personas(doc, full_text) if doc else self._identify_personas_fallback(full_text)
+        personas = self._identify_personas(doc) if doc else self._identify_personas_fallback(keyword_hits)
 
         # Extract technical dependencies
-        integrations = self._identify_integrations(full_text)
+        integrations = self._identify_integrations(keyword_hits)
 
         # Analyze complexity factors
-        complexity_factors = self._analyze_complexity(doc, entities, full_text) if doc else self._analyze_complexity_fallback(entities, full_text)
+        complexity_factors = self._analyze_complexity(doc, entities, keyword_hits) if doc else self._analyze_complexity_fallback(entities, keyword_hits)
 
         return {
             "entities": entities,
@@ -121,7 +341,7 @@ class AdvancedFeatureNLP:
             "complexity_factors": complexity_factors,
         }
 
-    def _extract_entities(self, doc, text: str) -> Dict[str, List[str]]:
+    def _extract_entities(self, doc) -> Dict[str, List[str]]:
         """Extract named entities using spaCy NER."""
         entities = {
             "technologies": [],
@@ -130,83 +350,30 @@ class AdvancedFeatureNLP:
             "data_objects": [],
         }
 
-        # Technology keywords
-        tech_keywords = [
-            "react",
-            "node",
-            "mongodb",
-            "jwt",
-            "api",
-            "rest",
-            "graphql",
-            "redis",
-            "aws",
-            "azure",
-            "docker",
-            "kubernetes",
-            "postgresql",
-            "mysql",
-            "firebase",
-            "sendgrid",
-            "stripe",
-            "javascript",
-            "typescript",
-            "python",
-            "java",
-            "spring",
-            "express",
-        ]
-
         # Extract entities
         for ent in doc.ents:
-            if ent.label_ == "PRODUCT" or ent.text.lower() in tech_keywords:
+            ent_lower = ent.text.lower()
+            if ent.label_ == "PRODUCT" or ent_lower in TECH_KEYWORDS:
                 entities["technologies"].append(ent.text)
-            elif ent.label_ == "PERSON" or ent.text.lower() in [
-                "user",
-                "admin",
-                "customer",
-                "manager",
-            ]:
+            elif ent.label_ == "PERSON" or ent_lower in ROLE_ENTITY_KEYWORDS:
                 entities["user_roles"].append(ent.text)
 
         # Extract verbs (actions)
-        for token in doc:
-            if token.pos_ == "VERB" and token.text.lower() in [
-                "create",
-                "read",
-                "update",
-                "delete",
-                "login",
-                "register",
-                "upload",
-                "download",
-                "send",
-                "receive",
-                "notify",
-                "manage",
-                "authenticate",
-                "authorize",
-                "validate",
-                "process",
-                "search",
-                "filter",
-                "export",
-                "import",
-            ]:
-                entities["actions"].append(token.text)
+        for _, start, end in self._action_matcher(doc):
+            entities["actions"].append(doc[start:end].text)
 
         # Extract nouns (data objects)
         for chunk in doc.noun_chunks:
             if chunk.root.pos_ == "NOUN":
                 entities["data_objects"].append(chunk.text)
 
-        # Remove duplicates
+        # Remove duplicates, keeping first-seen order so equal inputs give equal outputs
         for key in entities:
-            entities[key] = list(set(entities[key]))
+            entities[key] = list(dict.fromkeys(entities[key]))
 
         return entities
 
-    def _extract_entities_fallback(self, text: str) -> Dict[str, List[str]]:
+    def _extract_entities_fallback(self, keyword_hits: frozenset) -> Dict[str, List[str]]:
         """Fallback entity extraction without spaCy."""
         entities = {
             "technologies": [],
@@ -215,89 +382,85 @@ class AdvancedFeatureNLP:
             "data_objects": [],
         }
 
-        text_lower = text.lower()
-
-        # Technology keywords
-        tech_keywords = [
-            "react",
-            "node",
-            "mongodb",
-            "jwt",
-            "api",
-            "rest",
-            "graphql",
-            "redis",
-            "aws",
-            "azure",
-            "docker",
-            "kubernetes",
-        ]
-
-        for keyword in tech_keywords:
-            if keyword in text_lower:
+        for keyword in FALLBACK_TECH_KEYWORDS:
+            if keyword in keyword_hits:
                 entities["technologies"].append(keyword.title())
 
         # User roles
-        role_keywords = ["user", "admin", "customer", "manager", "developer"]
-        for role in role_keywords:
-            if role in text_lower:
+        for role in FALLBACK_ROLE_KEYWORDS:
+            if role in keyword_hits:
                 entities["user_roles"].append(role.title())
 
         # Actions
-        action_keywords = [
-            "create",
-            "read",
-            "update",
-            "delete",
-            "login",
-            "register",
-            "upload",
-            "download",
-        ]
-        for action in action_keywords:
-            if action in text_lower:
+        for action in FALLBACK_ACTION_KEYWORDS:
+            if action in keyword_hits:
                 entities["actions"].append(action)
 
         return entities
 
-    def _classify_intents(self, text: str) -> Dict:
-        """Classify the primary intent of the feature."""
-        if self.classifier:
-            try:
-                result = self.classifier(text, self.intent_categories)
-                return {
+    def _classify_intents(self, texts: List[str], keyword_hits: List[frozenset]) -> List[Dict]:
+        """
+        Classify the primary intent of each feature. Features whose keyword scores
+        are already decisive skip the classifier; the rest share one batched call.
+        """
+        heuristic = [self._classify_intents_fallback(hits) for hits in keyword_hits]
+        if not self.classifier:
+            return heuristic
+
+        undecided = []
+        for i, intents in enumerate(heuristic):
+            if self._is_decisive(intents):
+                intents["confidence"] = "heuristic"
+            else:
+                undecided.append(i)
+        self._intents_classified += len(texts)
+        self._intents_by_heuristic += len(texts) - len(undecided)
+        logger.debug(
+            "Intent cascade: %d/%d features settled by keywords (%d/%d overall)",
+            len(texts) - len(undecided),
+            len(texts),
+            self._intents_by_heuristic,
+            self._intents_classified,
+        )
+        if not undecided:
+            return heuristic
+
+        try:
+            results = self.classifier(
+                [texts[i] for i in undecided], self.intent_categories, batch_size=CLASSIFIER_BATCH_SIZE
+            )
+            if isinstance(results, dict):
+                results = [results]
+            for i, result in zip(undecided, results):
+                heuristic[i] = {
                     "primary": result["labels"][0],
                     "secondary": result["labels"][1:3],
                     "scores": {
                         label: score for label, score in zip(result["labels"], result["scores"])
                     },
                 }
-            except Exception as e:
-                logger.warning(f"Intent classification failed: {e}")
+        except Exception as e:
+            logger.warning(f"Intent classification failed: {e}")
+
+        return heuristic
+
+    @staticmethod
+    def _is_decisive(intents: Dict) -> bool:
+        """Whether keyword scores single out one intent clearly enough to trust."""
+        scores = sorted(intents["scores"].values(), reverse=True)
+        top = scores[0] if scores else 0.0
+        second = scores[1] if len(scores) > 1 else 0.0
+        return top >= INTENT_HEURISTIC_MIN_SCORE and top - second > INTENT_HEURISTIC_MIN_MARGIN
 
-        # Fallback: keyword-based classification
-        text_lower = text.lower()
+    def _classify_intents_fallback(self, keyword_hits: frozenset) -> Dict:
+        """Fallback: keyword-based classification."""
         intent_scores = {}
 
         for intent in self.intent_categories:
             score = 0.0
-            keywords = {
-                "Authentication": ["login", "auth", "password", "token", "session"],
-                "User Management": ["user", "profile", "account", "member"],
-                "CRUD Operations": ["create", "read", "update", "delete", "manage"],
-                "Payment Processing": ["payment", "stripe", "paypal", "billing", "invoice"],
-                "Email Notifications": ["email", "send", "notify", "mail"],
-                "File Management": ["file", "upload", "download", "document"],
-                "Reporting": ["report", "analytics", "dashboard", "metrics"],
-                "API Integration": ["api", "integrate", "webhook", "endpoint"],
-                "Data Analytics": ["analytics", "data", "statistics", "insights"],
-                "Search": ["search", "find", "filter", "query"],
-            }
-
-            if intent in keywords:
-                for keyword in keywords[intent]:
-                    if keyword in text_lower:
-                        score += 0.2
+            for keyword in INTENT_KEYWORDS.get(intent, ()):
+                if keyword in keyword_hits:
+                    score += 0.2
 
             intent_scores[intent] = min(score, 1.0)
 
@@ -310,53 +473,19 @@ class AdvancedFeatureNLP:
             "scores": intent_scores,
         }
 
-    def _extract_requirements(self, doc, text: str) -> Dict[str, List[str]]:
+    def _extract_requirements(self, doc) -> Dict[str, List[str]]:
         """Extract functional and non-functional requirements."""
-        requirements = {
-            "functional": [],
-            "non_functional": [],
+        # Sentence start -> text per bucket; matches arrive in document order
+        sentences = {
+            "functional": {},
+            "non_functional": {},
         }
 
-        # Functional requirement patterns
-        functional_patterns = [
-            "user can",
-            "system should",
-            "must allow",
-            "able to",
-            "functionality to",
-            "feature to",
-            "capability to",
-            "should be able",
-        ]
-
-        # Non-functional patterns
-        nfr_patterns = [
-            "secure",
-            "fast",
-            "scalable",
-            "reliable",
-            "available",
-            "performance",
-            "security",
-            "usability",
-            "maintainability",
-            "responsive",
-        ]
-
-        text_lower = text.lower()
+        for match_id, start, _ in self._requirement_matcher(doc):
+            sent = doc[start].sent
+            sentences[self.nlp.vocab.strings[match_id]].setdefault(sent.start, sent.text.strip())
 
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-
-            # Check for functional requirements
-            if any(pattern in sent_text for pattern in functional_patterns):
-                requirements["functional"].append(sent.text.strip())
-
-            # Check for non-functional requirements
-            if any(pattern in sent_text for pattern in nfr_patterns):
-                requirements["non_functional"].append(sent.text.strip())
-
-        return requirements
+        return {bucket: list(found.values()) for bucket, found in sentences.items()}
 
     def _extract_requirements_fallback(self, text: str) -> Dict[str, List[str]]:
         """Fallback requirement extraction."""
@@ -365,104 +494,55 @@ class AdvancedFeatureNLP:
             "non_functional": [],
         }
 
-        sentences = text.split(".")
-
-        functional_patterns = ["user can", "system should", "must allow", "able to"]
-        nfr_patterns = ["secure", "fast", "scalable", "reliable"]
+        if self._sentence_segmenter:
+            sentences = ((sentence, sentence.lower()) for sentence in self._sentence_segmenter.segment(text))
+        else:
+            # Lowercasing never adds or removes ".", so both splits line up
+            sentences = zip(text.split("."), text.lower().split("."))
 
-        for sentence in sentences:
-            sent_lower = sentence.lower()
-            if any(pattern in sent_lower for pattern in functional_patterns):
+        for sentence, sent_lower in sentences:
+            if any(pattern in sent_lower for pattern in FALLBACK_FUNCTIONAL_PATTERNS):
                 requirements["functional"].append(sentence.strip())
-            if any(pattern in sent_lower for pattern in nfr_patterns):
+            if any(pattern in sent_lower for pattern in FALLBACK_NFR_PATTERNS):
                 requirements["non_functional"].append(sentence.strip())
 
         return requirements
 
-    def _identify_personas(self, doc, text: str) -> List[str]:
+    def _identify_personas(self, doc) -> List[str]:
         """Identify user personas/roles."""
-        personas = set()
-
-        # Common role keywords
-        role_keywords = [
-            "user",
-            "admin",
-            "administrator",
-            "customer",
-            "manager",
-            "developer",
-            "team member",
-            "stakeholder",
-            "visitor",
-            "guest",
-            "subscriber",
-            "member",
-            "owner",
-            "moderator",
-        ]
+        # dict as an ordered set: first-seen order, no duplicates
+        personas: Dict[str, None] = {}
 
-        text_lower = text.lower()
-
-        for token in doc:
-            if token.text.lower() in role_keywords:
-                personas.add(token.text.title())
+        for _, start, end in self._persona_matcher(doc):
+            personas[doc[start:end].text.title()] = None
 
         # Also check entities
         for ent in doc.ents:
-            if ent.label_ == "PERSON" and ent.text.lower() in role_keywords:
-                personas.add(ent.text.title())
+            if ent.label_ == "PERSON" and ent.text.lower() in PERSONA_KEYWORDS:
+                personas[ent.text.title()] = None
 
         return list(personas) if personas else ["User"]
 
-    def _identify_personas_fallback(self, text: str) -> List[str]:
+    def _identify_personas_fallback(self, keyword_hits: frozenset) -> List[str]:
         """Fallback persona identification."""
-        personas = set()
-        role_keywords = [
-            "user",
-            "admin",
-            "customer",
-            "manager",
-            "developer",
-            "visitor",
-            "guest",
-        ]
-
-        text_lower = text.lower()
-        for role in role_keywords:
-            if role in text_lower:
-                personas.add(role.title())
+        personas: Dict[str, None] = {}
+        for role in FALLBACK_PERSONA_KEYWORDS:
+            if role in keyword_hits:
+                personas[role.title()] = None
 
         return list(personas) if personas else ["User"]
 
-    def _identify_integrations(self, text: str) -> List[Dict]:
+    def _identify_integrations(self, keyword_hits: frozenset) -> List[Dict]:
         """Identify third-party integrations."""
         integrations = []
 
-        integration_keywords = {
-            "sendgrid": "Email service",
-            "stripe": "Payment processing",
-            "twilio": "SMS service",
-            "aws s3": "File storage",
-            "google maps": "Location service",
-            "firebase": "Backend service",
-            "slack": "Communication",
-            "github": "Version control",
-            "jira": "Project management",
-            "aws": "Cloud services",
-            "azure": "Cloud services",
-            "mongodb": "Database",
-            "redis": "Cache",
-        }
-
-        text_lower = text.lower()
-
-        for service, purpose in integration_keywords.items():
-            if service in text_lower:
+        for service, purpose in INTEGRATION_KEYWORDS.items():
+            if service in keyword_hits:
                 integrations.append({"service": service.title(), "purpose": purpose})
 
         return integrations
 
-    def _analyze_complexity(self, doc, entities: Dict, text: str) -> List[str]:
+    def _analyze_complexity(self, doc, entities: Dict, keyword_hits: frozenset) -> List[str]:
         """Identify complexity factors."""
         factors = []
 
@@ -473,19 +553,17 @@ class AdvancedFeatureNLP:
 
         # Check for CRUD operations
         crud_actions = [
-            a for a in entities.get("actions", []) if a.lower() in ["create", "read", "update", "delete"]
+            a for a in entities.get("actions", []) if a.lower() in CRUD_ACTIONS
         ]
         if len(crud_actions) >= 3:
             factors.append("Full CRUD operations required")
 
         # Check for authentication/security
-        security_keywords = ["auth", "login", "secure", "encrypt", "password"]
-        if any(keyword in text.lower() for keyword in security_keywords):
+        if any(keyword in keyword_hits for keyword in SECURITY_KEYWORDS):
             factors.append("Security and authentication required")
 
         # Check for real-time features
-        realtime_keywords = ["real-time", "live", "instant", "websocket", "socket"]
-        if any(keyword in text.lower() for keyword in realtime_keywords):
+        if any(keyword in keyword_hits for keyword in REALTIME_KEYWORDS):
             factors.append("Real-time functionality needed")
 
         # Check for multiple user roles
@@ -495,15 +573,14 @@ class AdvancedFeatureNLP:
 
         return factors
 
-    def _analyze_complexity_fallback(self, entities: Dict, text: str) -> List[str]:
+    def _analyze_complexity_fallback(self, entities: Dict, keyword_hits: frozenset) -> List[str]:
         """Fallback complexity analysis."""
         factors = []
 
         if entities.get("technologies"):
             factors.append(f"Uses technologies: {', '.join(entities['technologies'][:3])}")
 
-        text_lower = text.lower()
-        if any(kw in text_lower for kw in ["auth", "login", "secure"]):
+        if any(kw in keyword_hits for kw in FALLBACK_SECURITY_KEYWORDS):
             factors.append("Security and authentication required")
 
         return factors
@@ -513,7 +590,7 @@ class AdvancedFeatureNLP:
         stories = []
 
         personas = analysis["personas"]
-        actions = analysis["entities"]["actions"]
+        actions = [(act, act.lower()) for act in analysis["entities"]["actions"]]
         requirements = analysis["functional_requirements"]
 
         # Generate stories from requirements
@@ -523,8 +600,9 @@ class AdvancedFeatureNLP:
 
             # Extract action from requirement
             action = "perform an action"
-            for act in actions:
-                if act.lower() in req.lower():
+            req_lower = req.lower()
+            for act, act_lower in actions:
+                if act_lower in req_lower:
                     action = act
                     break
 
@@ -547,13 +625,13 @@ class AdvancedFeatureNLP:
     def _estimate_points(self, requirement: str) -> int:
         """Estimate story points based on requirement complexity."""
         # Simple heuristic based on length and keywords
-        complexity_keywords = ["integrate", "complex", "multiple", "secure", "real-time"]
+        requirement_lower = requirement.lower()
 
         points = 3  # Base points
 
         # Add points for complexity
-        for keyword in complexity_keywords:
-            if keyword in requirement.lower():
+        for keyword in STORY_COMPLEXITY_KEYWORDS:
+            if keyword in requirement_lower:
                 points += 2
 
         # Adjust based on length
@@ -564,6 +642,8 @@ class AdvancedFeatureNLP:
         return min(points, 13)
 
 
-# Create global instance
-nlp_analyzer = AdvancedFeatureNLP()
+@lru_cache
+def get_nlp_analyzer() -> AdvancedFeatureNLP:
+    """Shared analyzer, built on first use so importing this module loads no models."""
+    return AdvancedFeatureNLP()
 
@@ -1,17 +1,76 @@
-from collections import defaultdict, deque
-from typing import Dict, List, Set, Tuple
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# DFS node states for cycle detection
+WHITE, GRAY, BLACK = 0, 1, 2
+
+
+def _kahn_kernel(indptr, indices, in_degree, durations, n_tasks, topo, levels, distances, predecessors) -> int:
+    """
+    Fused Kahn sweep over CSR adjacency with dense node indices; the first
+    ``n_tasks`` indices are tasks, the rest are unknown dependency ids.
+    ``topo`` doubles as the FIFO queue. Fills the output sequences in place
+    and returns how many tasks were ordered. ``in_degree`` is consumed.
+    """
+    tail = 0
+    for node in range(n_tasks):
+        if in_degree[node] == 0:
+            topo[tail] = node
+            tail += 1
+
+    head = 0
+    while head < tail:
+        node = topo[head]
+        head += 1
+        if distances[node] == -np.inf:
+            distances[node] = durations[node]
+
+        for edge in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[edge]
+            if levels[neighbor] < levels[node] + 1:
+                levels[neighbor] = levels[node] + 1
+            distance = distances[node] + durations[neighbor]
+            if distances[neighbor] < distance:
+                distances[neighbor] = distance
+                predecessors[neighbor] = node
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                topo[tail] = neighbor
+                tail += 1
+
+    return tail
+
+
+# Compiled once per process (cached on disk) when Numba is installed
+_kahn_kernel_jit = (
+    numba.njit(cache=True, boundscheck=False)(_kahn_kernel) if NUMBA_AVAILABLE else None
+)
 
 
 class DependencyAnalyzer:
     """
     Builds task dependency graph, detects cycles, identifies critical path, and
     suggests optimal sequencing for parallel execution.
+
+    The graph is built from ``tasks`` once, and the scheduling sweep behind
+    topological_sort, critical_path and parallel_execution runs at most once
+    per instance. Build a new analyzer after changing tasks or dependencies.
     """
 
     def __init__(self, tasks: List[Dict]):
         self.tasks = {task["id"]: task for task in tasks}
         self.graph = self._build_graph(tasks)
         self.in_degree = self._calculate_in_degrees()
+        self._build_csr()
 
     def _build_graph(self, tasks: List[Dict]) -> Dict[str, List[str]]:
         graph = defaultdict(list)
@@ -27,62 +86,146 @@ class DependencyAnalyzer:
                 in_degree[neighbor] += 1
         return in_degree
 
+    def _build_csr(self) -> None:
+        """
+        Mirror the adjacency lists as CSR int32 arrays over dense node indices:
+        neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+        """
+        self.node_ids = list(self.tasks) + [node for node in self.graph if node not in self.tasks]
+        self.idx = {node: i for i, node in enumerate(self.node_ids)}
+
+        self.indptr = np.zeros(len(self.node_ids) + 1, dtype=np.int32)
+        for node, neighbors in self.graph.items():
+            self.indptr[self.idx[node] + 1] = len(neighbors)
+        np.cumsum(self.indptr, out=self.indptr)
+
+        self.indices = np.empty(int(self.indptr[-1]), dtype=np.int32)
+        for node, neighbors in self.graph.items():
+            start = self.indptr[self.idx[node]]
+            self.indices[start:start + len(neighbors)] = [self.idx[n] for n in neighbors]
+
+        self.in_degree_array = np.array(
+            [self.in_degree.get(node, 0) for node in self.node_ids], dtype=np.int32
+        )
+        self.durations = np.array(
+            [self.tasks[node].get("duration", 1) for node in self.tasks], dtype=np.float64
+        )
+
     def detect_cycles(self) -> bool:
-        visited: Set[str] = set()
-        rec_stack: Set[str] = set()
-
-        def dfs(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            for neighbor in self.graph.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            rec_stack.remove(node)
-            return False
+        # Standalone check for callers; analyze() learns about cycles from the Kahn sweep.
+        # Iterative DFS: long dependency chains would exceed the recursion limit.
+        # Nodes on the current path are GRAY, finished nodes BLACK.
+        color: Dict[str, int] = {}
 
-        for node in self.graph:
-            if node not in visited:
-                if dfs(node):
-                    return True
+        for root in self.graph:
+            if root in color:
+                continue
+            color[root] = GRAY
+            stack = [(root, iter(self.graph.get(root, [])))]
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    state = color.get(neighbor, WHITE)
+                    if state == GRAY:
+                        return True
+                    if state == WHITE:
+                        color[neighbor] = GRAY
+                        stack.append((neighbor, iter(self.graph.get(neighbor, []))))
+                        break
+                else:
+                    color[node] = BLACK
+                    stack.pop()
         return False
 
-    def topological_sort(self) -> List[str]:
-        in_degree = self.in_degree.copy()
-        queue = deque([node for node in self.tasks if in_degree.get(node, 0) == 0])
-        topo_order = []
+    def _kahn_fused(
+        self,
+    ) -> Tuple[List[str], Dict[str, int], Dict[str, float], Dict[str, Optional[str]]]:
+        """
+        One Kahn sweep producing everything the scheduling views need: the
+        topological order, each task's parallel-execution level, and the
+        longest-path distances and predecessors for the critical path.
+        Tasks on or behind a cycle are left out of the order.
+        """
+        n_tasks = len(self.tasks)
+        n_nodes = len(self.node_ids)
+        if _kahn_kernel_jit is not None:
+            topo = np.empty(n_tasks, dtype=np.int32)
+            levels = np.zeros(n_nodes, dtype=np.int64)
+            distances = np.full(n_nodes, -np.inf)
+            predecessors = np.full(n_nodes, -1, dtype=np.int32)
+            count = _kahn_kernel_jit(
+                self.indptr,
+                self.indices,
+                self.in_degree_array.copy(),
+                self.durations,
+                n_tasks,
+                topo,
+                levels,
+                distances,
+                predecessors,
+            )
+            topo, levels, distances, predecessors = (
+                topo.tolist(),
+                levels.tolist(),
+                distances.tolist(),
+                predecessors.tolist(),
+            )
+        else:
+            # Python ints index faster than numpy scalars in an interpreted loop
+            topo = [0] * n_tasks
+            levels = [0] * n_nodes
+            distances = [float("-inf")] * n_nodes
+            predecessors = [-1] * n_nodes
+            count = _kahn_kernel(
+                self.indptr.tolist(),
+                self.indices.tolist(),
+                self.in_degree_array.tolist(),
+                self.durations.tolist(),
+                n_tasks,
+                topo,
+                levels,
+                distances,
+                predecessors,
+            )
 
-        while queue:
-            current = queue.popleft()
-            topo_order.append(current)
-
-            for neighbor in self.graph.get(current, []):
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+        ids = self.node_ids
+        topo_order = [ids[i] for i in topo[:count]]
+        levels = {ids[i]: levels[i] for i in range(n_tasks)}
+        distances = {ids[i]: distances[i] for i in range(n_tasks)}
+        predecessors = {
+            ids[i]: ids[pred] if pred >= 0 else None for i, pred in enumerate(predecessors[:n_tasks])
+        }
+        return topo_order, levels, distances, predecessors
 
-        if len(topo_order) != len(self.tasks):
-            raise ValueError("Cycle detected in dependencies")
+    @cached_property
+    def _schedule(
+        self,
+    ) -> Tuple[List[str], Dict[str, int], Dict[str, float], Dict[str, Optional[str]]]:
+        return self._kahn_fused()
 
-        return topo_order
+    def topological_sort(self) -> List[str]:
+        return list(self._sorted_schedule()[0])
 
     def critical_path(self) -> List[str]:
-        distances = {task_id: float("-inf") for task_id in self.tasks}
-        predecessors = {task_id: None for task_id in self.tasks}
+        _, _, distances, predecessors = self._sorted_schedule()
+        return self._trace_critical_path(distances, predecessors)
 
-        topo_order = self.topological_sort()
-        for node in topo_order:
-            if distances[node] == float("-inf"):
-                distances[node] = self.tasks[node].get("duration", 1)
+    def parallel_execution(self) -> List[List[str]]:
+        topo_order, levels, _, _ = self._schedule
+        return self._group_levels(topo_order, levels)
 
-            for neighbor in self.graph.get(node, []):
-                duration = self.tasks[neighbor].get("duration", 1)
-                if distances[neighbor] < distances[node] + duration:
-                    distances[neighbor] = distances[node] + duration
-                    predecessors[neighbor] = node
+    def _sorted_schedule(
+        self,
+    ) -> Tuple[List[str], Dict[str, int], Dict[str, float], Dict[str, Optional[str]]]:
+        schedule = self._schedule
+        if len(schedule[0]) != len(self.tasks):
+            raise ValueError("Cycle detected in dependencies")
+        return schedule
 
+    @staticmethod
+    def _trace_critical_path(
+        distances: Dict[str, float], predecessors: Dict[str, Optional[str]]
+    ) -> List[str]:
         end_node = max(distances, key=distances.get)
         path = []
         while end_node:
@@ -91,45 +234,36 @@ class DependencyAnalyzer:
 
         return list(reversed(path))
 
-    def parallel_execution(self) -> List[List[str]]:
-        level = defaultdict(int)
-        queue = deque([node for node in self.tasks if self.in_degree.get(node, 0) == 0])
-
-        while queue:
-            node = queue.popleft()
-            for neighbor in self.graph.get(node, []):
-                level[neighbor] = max(level[neighbor], level[node] + 1)
-                self.in_degree[neighbor] -= 1
-                if self.in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-
+    @staticmethod
+    def _group_levels(topo_order: List[str], levels: Dict[str, int]) -> List[List[str]]:
         parallel_levels = defaultdict(list)
-        for node, lvl in level.items():
-            parallel_levels[lvl].append(node)
+        for node in topo_order:
+            parallel_levels[levels[node]].append(node)
 
         return [nodes for _, nodes in sorted(parallel_levels.items())]
 
     def impact_analysis(self, task_id: str) -> List[str]:
         affected = set()
-
-        def dfs(current: str):
+        stack = [task_id]
+        while stack:
+            current = stack.pop()
             for neighbor in self.graph.get(current, []):
                 if neighbor not in affected:
                     affected.add(neighbor)
-                    dfs(neighbor)
+                    stack.append(neighbor)
 
-        dfs(task_id)
         return list(affected)
 
     def analyze(self) -> Dict[str, any]:
-        cycles = self.detect_cycles()
-        if cycles:
+        # Kahn's sweep leaves out tasks on or behind a cycle
+        topo_order, levels, distances, predecessors = self._schedule
+        if len(topo_order) != len(self.tasks):
             return {"error": "Cycle detected; please resolve before scheduling"}
 
         return {
-            "topological_order": self.topological_sort(),
-            "critical_path": self.critical_path(),
-            "parallel_execution": self.parallel_execution(),
+            "topological_order": list(topo_order),
+            "critical_path": self._trace_critical_path(distances, predecessors),
+            "parallel_execution": self._group_levels(topo_order, levels),
             "impact_analysis": self.impact_analysis(next(iter(self.tasks))),
         }
 
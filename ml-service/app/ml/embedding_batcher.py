@@ -0,0 +1,117 @@
+"""
+Micro-batching front end for sentence-transformer encoding.
+Concurrent requests are queued and encoded together in a single model call,
+optionally inside a pool of worker processes that each keep the model loaded.
+"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sentence-transformer loaded once per embedding worker process.
+_worker_embedder = None
+
+
+def init_embedding_worker(model_name: str) -> None:
+    """Process pool initializer: load the sentence-transformer into the worker."""
+    global _worker_embedder
+    from sentence_transformers import SentenceTransformer
+
+    _worker_embedder = SentenceTransformer(model_name)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> np.ndarray:
+    return _worker_embedder.encode(texts, batch_size=batch_size)
+
+
+class EmbeddingBatcher:
+    """
+    Collects encode requests for up to ``max_wait`` seconds (or ``max_batch`` texts,
+    whichever comes first) and runs them through the embedder as one batch. Batches
+    run on the in-process embedder in the default executor, or on worker processes
+    initialized with init_embedding_worker when ``executor`` is given.
+    """
+
+    MAX_BATCH = 32
+    MAX_WAIT = 0.01
+
+    def __init__(
+        self,
+        embedder,
+        max_batch: int = MAX_BATCH,
+        max_wait: float = MAX_WAIT,
+        executor: Optional[Executor] = None,
+    ):
+        self.embedder = embedder
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Encode a single text, sharing the model call with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background worker and any embedding worker processes."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._encode_batch(loop, batch)
+
+    async def _encode_batch(
+        self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        texts = [text for text, _ in batch]
+        if self.executor is not None:
+            encode = partial(_encode_in_worker, texts, self.max_batch)
+        else:
+            encode = partial(self.embedder.encode, texts, batch_size=self.max_batch)
+        try:
+            embeddings = await loop.run_in_executor(self.executor, encode)
+        except Exception as e:
+            logger.warning(f"Batch embedding failed for {len(texts)} texts: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
@@ -1,31 +1,178 @@
+import copy
+import hashlib
 import math
 import re
-from typing import Dict, List, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
-from app.ml.story_analyzer import StoryAnalyzer
-from app.utils.logger import get_logger
-
-# Try to import advanced NLP analyzer
 try:
-    from app.ml.advanced_feature_nlp import nlp_analyzer
-    ADVANCED_NLP_AVAILABLE = True
+    import numba
+    NUMBA_AVAILABLE = True
 except ImportError:
-    ADVANCED_NLP_AVAILABLE = False
-    nlp_analyzer = None
+    NUMBA_AVAILABLE = False
+
+from app.ml.story_analyzer import StoryAnalyzer
+from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache
+def _advanced_nlp_getter():
+    """
+    Import the advanced NLP analyzer (spaCy, transformers) on first use rather
+    than with this module. Returns its getter, or None when it cannot be imported.
+    """
+    try:
+        from app.ml.advanced_feature_nlp import get_nlp_analyzer
+    except ImportError:
+        return None
+    return get_nlp_analyzer
+
+
+# Breakdowns kept per process, keyed by a hash of the feature inputs
+BREAKDOWN_CACHE_SIZE = 1024
+
+# Sentence boundaries for splitting feature descriptions
+_SENT_SPLIT = re.compile(r"[.!?]\s+")
+
+
+def _drop_implied(phrases: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Drop phrases that contain a shorter phrase of the same group: whenever they
+    occur in a text the shorter one does too, so scanning for them is wasted work.
+    """
+    return tuple(
+        phrase for phrase in phrases if not any(other != phrase and other in phrase for other in phrases)
+    )
+
+
+# Persona -> phrases that signal it
+_PERSONA_PATTERNS = (
+    ("admin", ("admin", "administrator", "system admin", "super user")),
+    ("user", ("user", "customer", "client", "end user", "member")),
+    ("developer", ("developer", "dev", "engineer", "programmer")),
+    ("manager", ("manager", "project manager", "team lead", "supervisor")),
+    ("guest", ("guest", "visitor", "anonymous")),
+    ("moderator", ("moderator", "editor", "content manager")),
+)
+# Scanned form: e.g. "administrator" and "system admin" are covered by "admin"
+_PERSONA_SCAN = tuple((persona, _drop_implied(patterns)) for persona, patterns in _PERSONA_PATTERNS)
+
+# Words that make a description sentence a requirement
+_REQUIREMENT_KEYWORDS = ("must", "should", "need", "require", "allow", "enable", "support")
+
+# Keyword -> generic functional requirement it implies
+_FUNCTIONAL_KEYWORDS = (
+    ("authentication", "User authentication and authorization"),
+    ("payment", "Payment processing and transactions"),
+    ("notification", "Notification and messaging system"),
+    ("report", "Reporting and analytics"),
+    ("search", "Search and filtering capabilities"),
+    ("upload", "File upload and management"),
+    ("export", "Data export functionality"),
+    ("integration", "External system integration"),
+    ("dashboard", "Dashboard and visualization"),
+    ("api", "API endpoints and services"),
+)
+
+# Keyword -> complexity it adds to a feature
+_COMPLEX_KEYWORDS = (
+    ("integration", 2.0),
+    ("authentication", 1.5),
+    ("payment", 2.0),
+    ("real-time", 1.5),
+    ("analytics", 1.0),
+    ("report", 1.0),
+)
+
+# Advanced NLP complexity factor (by its leading text) -> complexity it adds
+_FACTOR_WEIGHTS = (
+    ("Uses multiple technologies", 2.0),
+    ("Uses technologies", 2.0),
+    ("Full CRUD operations required", 1.0),
+    ("Security and authentication required", 1.5),
+    ("Real-time functionality needed", 1.5),
+    ("Multiple user roles", 1.0),
+)
+
+_ACTION_VERBS = ("create", "update", "delete", "view", "manage", "configure", "access", "edit", "upload", "download")
+
+_BENEFIT_KEYWORDS = (
+    ("efficient", "I can work more efficiently"),
+    ("quick", "I can complete tasks quickly"),
+    ("easy", "I can use the system easily"),
+    ("secure", "My data is secure"),
+    ("accurate", "I get accurate information"),
+)
+
+# Breakdown area -> (preferred key, fallback key) for its complexity
+_BREAKDOWN_KEYS = (
+    ("ui", ("ui_complexity", "ui")),
+    ("backend", ("backend_complexity", "backend")),
+    ("integration", ("integration_complexity", "integration")),
+    ("testing", ("testing_complexity", "testing")),
+)
+
+# Acceptance criteria every story starts with
+_BASE_CRITERIA = (
+    "System validates all inputs correctly",
+    "User receives clear feedback on actions",
+    "Error messages are helpful and actionable",
+)
+
+# Testing task added when no other tasks apply; copied per story since tasks are returned mutable
+_DEFAULT_TEST_TASK = {
+    "title": "Add tests",
+    "description": "Write tests for the implementation",
+    "estimated_hours": 2,
+    "type": "testing",
+}
+
+_UI_KEYWORDS = (
+    ("form", "form"),
+    ("page", "page"),
+    ("modal", "modal"),
+    ("dashboard", "dashboard"),
+    ("list", "list view"),
+    ("table", "table"),
+)
+
+
+def _pack_sprints(points, capacity, sprint_of) -> int:
+    """
+    Greedy in-order packing: a story that would overflow the current sprint
+    opens the next one. Writes each story's 1-based sprint number into
+    ``sprint_of`` and returns the number of sprints.
+    """
+    sprint_number = 1
+    sprint_points = 0.0
+    for i in range(len(points)):
+        if sprint_points + points[i] > capacity:
+            sprint_number += 1
+            sprint_points = 0.0
+        sprint_of[i] = sprint_number
+        sprint_points += points[i]
+    return sprint_number
+
+
+# Compiled once per process (cached on disk) when Numba is installed
+_pack_sprints_jit = numba.njit(cache=True)(_pack_sprints) if NUMBA_AVAILABLE else None
+
+
 class FeatureBreakdownModel:
     """
     AI-powered feature breakdown using NLP to analyze features and generate stories with tasks.
     """
 
-    def __init__(self):
-        self.embedder = SentenceTransformer(StoryAnalyzer.MODEL_NAME)
-        self.story_analyzer = StoryAnalyzer()
+    def __init__(self, story_analyzer: Optional[StoryAnalyzer] = None):
+        self.story_analyzer = story_analyzer or StoryAnalyzer()
+        self._breakdown_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._breakdown_cache_lock = threading.Lock()
 
     def analyze_feature(
         self, title: str, description: str, business_value: str = "", acceptance_criteria: List[str] = None
@@ -38,12 +185,16 @@ class FeatureBreakdownModel:
         acceptance_criteria = acceptance_criteria or []
 
         # Use advanced NLP if available
-        if ADVANCED_NLP_AVAILABLE and nlp_analyzer:
+        get_nlp_analyzer = _advanced_nlp_getter()
+        if get_nlp_analyzer is not None:
             try:
-                nlp_result = nlp_analyzer.analyze_feature(title, description, business_value)
+                nlp_result = get_nlp_analyzer().analyze_feature(title, description, business_value)
                 
-                # Map advanced NLP results to expected format
-                complexity = self._estimate_feature_complexity(description, acceptance_criteria)
+                # Map advanced NLP results to expected format; the score comes from the
+                # factors NLP already found instead of rescanning the description
+                complexity = self._complexity_from_factors(
+                    nlp_result.get("complexity_factors", []), len(acceptance_criteria), len(description)
+                )
                 
                 return {
                     "complexity": round(complexity, 1),
@@ -63,20 +214,23 @@ class FeatureBreakdownModel:
             except Exception as e:
                 logger.warning(f"Advanced NLP analysis failed, using fallback: {e}")
 
-        # Fallback to basic analysis
-        full_text = f"{title} {description} {business_value}".lower()
+        # Fallback to basic analysis; lowercase and split the description once for all helpers
+        text_lower = description.lower()
+        sentences = self._split_sentences(description)
 
         # Analyze complexity
-        complexity = self._estimate_feature_complexity(description, acceptance_criteria)
+        complexity = self._estimate_feature_complexity(description, acceptance_criteria, text_lower=text_lower)
 
         # Identify personas
-        personas = self.identify_personas(description)
+        personas = self.identify_personas(description, text_lower=text_lower)
 
         # Extract functional components
-        components = self._identify_components(description)
+        components = self._identify_components(description, sentences=sentences)
 
         # Extract requirements
-        requirements = self.extract_functional_requirements(description, acceptance_criteria)
+        requirements = self.extract_functional_requirements(
+            description, acceptance_criteria, sentences=sentences, text_lower=text_lower
+        )
 
         return {
             "complexity": round(complexity, 1),
@@ -87,27 +241,18 @@ class FeatureBreakdownModel:
             "confidence": 0.85,
         }
 
-    def identify_personas(self, description: str) -> List[str]:
+    def identify_personas(self, description: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Identify user personas from feature description using NLP patterns.
+        ``text_lower`` may pass in an already lowercased description.
         """
-        text = description.lower()
+        text = text_lower if text_lower is not None else description.lower()
         personas = []
 
-        # Common persona patterns
-        persona_patterns = {
-            "admin": ["admin", "administrator", "system admin", "super user"],
-            "user": ["user", "customer", "client", "end user", "member"],
-            "developer": ["developer", "dev", "engineer", "programmer"],
-            "manager": ["manager", "project manager", "team lead", "supervisor"],
-            "guest": ["guest", "visitor", "anonymous"],
-            "moderator": ["moderator", "editor", "content manager"],
-        }
-
-        for persona, patterns in persona_patterns.items():
+        # Personas are unique in the table, so no duplicate check is needed
+        for persona, patterns in _PERSONA_SCAN:
             if any(pattern in text for pattern in patterns):
-                if persona not in personas:
-                    personas.append(persona)
+                personas.append(persona)
 
         # Default to user if no personas found
         if not personas:
@@ -115,43 +260,41 @@ class FeatureBreakdownModel:
 
         return personas
 
-    def extract_functional_requirements(self, description: str, acceptance_criteria: List[str] = None) -> List[str]:
+    def extract_functional_requirements(
+        self,
+        description: str,
+        acceptance_criteria: List[str] = None,
+        sentences: Optional[List[str]] = None,
+        text_lower: Optional[str] = None,
+    ) -> List[str]:
         """
         Extract functional requirements from feature description.
+        ``sentences`` (from _split_sentences) and ``text_lower`` may pass in
+        precomputed forms of the description.
         """
         requirements = []
-        text = description.lower()
+        text = text_lower if text_lower is not None else description.lower()
         acceptance_criteria = acceptance_criteria or []
 
         # Extract from description
-        sentences = re.split(r"[.!?]\s+", description)
+        if sentences is None:
+            sentences = self._split_sentences(description)
         for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 20 and any(
-                keyword in sentence.lower()
-                for keyword in ["must", "should", "need", "require", "allow", "enable", "support"]
-            ):
+            if len(sentence) <= 20:
+                continue
+            # Lowercase once per sentence, not once per keyword tried
+            sentence_lower = sentence.lower()
+            if any(keyword in sentence_lower for keyword in _REQUIREMENT_KEYWORDS):
                 requirements.append(sentence)
 
         # Add acceptance criteria as requirements
         requirements.extend(acceptance_criteria)
 
-        # Extract common functional patterns
-        functional_keywords = {
-            "authentication": "User authentication and authorization",
-            "payment": "Payment processing and transactions",
-            "notification": "Notification and messaging system",
-            "report": "Reporting and analytics",
-            "search": "Search and filtering capabilities",
-            "upload": "File upload and management",
-            "export": "Data export functionality",
-            "integration": "External system integration",
-            "dashboard": "Dashboard and visualization",
-            "api": "API endpoints and services",
-        }
-
-        for keyword, req in functional_keywords.items():
-            if keyword in text and req not in requirements:
+        # Extract common functional patterns; criteria from the payload may not be hashable
+        seen = {req for req in requirements if isinstance(req, str)}
+        for keyword, req in _FUNCTIONAL_KEYWORDS:
+            if keyword in text and req not in seen:
+                seen.add(req)
                 requirements.append(req)
 
         return requirements[:10] if requirements else ["General functional requirements"]
@@ -162,32 +305,37 @@ class FeatureBreakdownModel:
         """
         Generate user stories from requirements and personas.
         """
-        stories = []
-        total_points = 0
-
         # Group requirements into story candidates
         story_candidates = self._group_requirements_into_stories(requirements, description)
 
-        for idx, candidate in enumerate(story_candidates):
+        # Every story-level helper reads the lowercase candidate; build it once each
+        candidates_lower = [candidate.lower() for candidate in story_candidates]
+
+        story_descriptions = []
+        for candidate, candidate_lower in zip(story_candidates, candidates_lower):
             # Determine persona for this story
-            persona = self._select_persona_for_story(candidate, personas)
+            persona = self._select_persona_for_story(candidate, personas, candidate_lower)
 
             # Create story description
-            action = self._extract_action_from_text(candidate)
-            benefit = self._extract_benefit_from_text(candidate, description)
+            action = self._extract_action_from_text(candidate, candidate_lower)
+            benefit = self._extract_benefit_from_text(candidate, description, candidate_lower)
 
-            story_description = f"As a {persona}, I want to {action} so that {benefit}"
+            story_descriptions.append(f"As a {persona}, I want to {action} so that {benefit}")
 
-            # Analyze story complexity
-            analysis = self.story_analyzer.analyze_story(title, story_description, [])
+        # Analyze story complexity, embedding every story in one batch
+        analyses = self.story_analyzer.analyze_stories_batch(title, story_descriptions, [])
+
+        stories = []
+        for idx, (candidate, candidate_lower, story_description, analysis) in enumerate(
+            zip(story_candidates, candidates_lower, story_descriptions, analyses)
+        ):
             points = analysis.get("estimated_story_points", 5)
-            total_points += points
 
             # Generate acceptance criteria
-            criteria = self.generate_acceptance_criteria(candidate, description)
+            criteria = self.generate_acceptance_criteria(candidate, description, candidate_lower)
 
             # Generate tasks for this story
-            tasks = self.generate_tasks_for_story(candidate, story_description, analysis)
+            tasks = self.generate_tasks_for_story(candidate, story_description, analysis, candidate_lower)
 
             stories.append(
                 {
@@ -195,29 +343,39 @@ class FeatureBreakdownModel:
                     "description": story_description,
                     "acceptance_criteria": criteria,
                     "estimated_points": points,
-                    "priority": self._determine_priority(points, candidate),
+                    "priority": self._determine_priority(points, candidate, candidate_lower),
                     "tasks": tasks,
                 }
             )
 
         return stories
 
-    def generate_tasks_for_story(self, story_text: str, story_description: str, analysis: Dict) -> List[Dict[str, Any]]:
+    def generate_tasks_for_story(
+        self, story_text: str, story_description: str, analysis: Dict, text_lower: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Generate tasks for a story based on complexity breakdown.
+        ``text_lower`` may pass in an already lowercased story text.
         """
+        if text_lower is None:
+            text_lower = story_text.lower()
         tasks = []
         breakdown = analysis.get("breakdown", {})
         complexity = analysis.get("complexity_score", 5)
+        # A zero or missing *_complexity value falls back to the short key
+        complexities = {
+            area: breakdown.get(preferred) or breakdown.get(fallback, 0)
+            for area, (preferred, fallback) in _BREAKDOWN_KEYS
+        }
 
         # UI Tasks
-        ui_complexity = breakdown.get("ui_complexity", 0) or breakdown.get("ui", 0)
+        ui_complexity = complexities["ui"]
         if ui_complexity > 2:
             tasks.extend(
                 [
                     {
-                        "title": f"Create {self._extract_ui_component(story_text)} UI",
-                        "description": f"Design and implement user interface for {story_text.lower()}",
+                        "title": f"Create {self._extract_ui_component(story_text, text_lower)} UI",
+                        "description": f"Design and implement user interface for {text_lower}",
                         "estimated_hours": max(2, int(ui_complexity * 1.5)),
                         "type": "frontend",
                     },
@@ -231,7 +389,7 @@ class FeatureBreakdownModel:
             )
 
         # Backend Tasks
-        backend_complexity = breakdown.get("backend_complexity", 0) or breakdown.get("backend", 0)
+        backend_complexity = complexities["backend"]
         if backend_complexity > 2:
             tasks.extend(
                 [
@@ -251,7 +409,7 @@ class FeatureBreakdownModel:
             )
 
         # Integration Tasks
-        integration_complexity = breakdown.get("integration_complexity", 0) or breakdown.get("integration", 0)
+        integration_complexity = complexities["integration"]
         if integration_complexity > 2:
             tasks.append(
                 {
@@ -263,7 +421,7 @@ class FeatureBreakdownModel:
             )
 
         # Testing Tasks
-        testing_complexity = breakdown.get("testing_complexity", 0) or breakdown.get("testing", 0)
+        testing_complexity = complexities["testing"]
         if testing_complexity > 1:
             tasks.append(
                 {
@@ -286,28 +444,57 @@ class FeatureBreakdownModel:
         if not tasks:
             tasks = [
                 {
-                    "title": f"Implement {story_text.lower()}",
+                    "title": f"Implement {text_lower}",
                     "description": story_description,
                     "estimated_hours": max(2, int(complexity * 0.8)),
                     "type": "development",
                 },
-                {
-                    "title": "Add tests",
-                    "description": "Write tests for the implementation",
-                    "estimated_hours": 2,
-                    "type": "testing",
-                },
+                dict(_DEFAULT_TEST_TASK),
             ]
 
         return tasks
 
     def break_down_feature(
-        self, title: str, description: str, business_value: str = "", acceptance_criteria: List[str] = None
+        self,
+        title: str,
+        description: str,
+        business_value: str = "",
+        acceptance_criteria: List[str] = None,
+        force: bool = False,
     ) -> Dict[str, Any]:
         """
         Complete feature breakdown: analysis + stories + tasks.
+        Results are cached by content; force=True recomputes.
         """
         acceptance_criteria = acceptance_criteria or []
+        # repr keeps the key unambiguous and tolerates non-string payload values
+        key = hashlib.blake2b(
+            repr((title, description, business_value, tuple(acceptance_criteria))).encode(),
+            digest_size=16,
+        ).digest()
+
+        if not force:
+            with self._breakdown_cache_lock:
+                cached = self._breakdown_cache.get(key)
+                if cached is not None:
+                    self._breakdown_cache.move_to_end(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        breakdown = self._break_down_feature(title, description, business_value, acceptance_criteria)
+
+        with self._breakdown_cache_lock:
+            self._breakdown_cache[key] = breakdown
+            self._breakdown_cache.move_to_end(key)
+            if len(self._breakdown_cache) > BREAKDOWN_CACHE_SIZE:
+                self._breakdown_cache.popitem(last=False)
+
+        # Callers may mutate what they get back; the cached breakdown must stay intact
+        return copy.deepcopy(breakdown)
+
+    def _break_down_feature(
+        self, title: str, description: str, business_value: str, acceptance_criteria: List[str]
+    ) -> Dict[str, Any]:
 
         # Step 1: Analyze feature
         analysis = self.analyze_feature(title, description, business_value, acceptance_criteria)
@@ -331,29 +518,35 @@ class FeatureBreakdownModel:
             "confidence": analysis.get("confidence", 0.85),
         }
 
-    def _estimate_feature_complexity(self, description: str, acceptance_criteria: List[str]) -> float:
+    def _estimate_feature_complexity(
+        self, description: str, acceptance_criteria: List[str], text_lower: Optional[str] = None
+    ) -> float:
         """Estimate overall feature complexity (0-10 scale)."""
         base_complexity = min(len(description) / 100, 5.0)
         criteria_bonus = len(acceptance_criteria) * 0.5
         keyword_complexity = 0
 
-        complex_keywords = {
-            "integration": 2.0,
-            "authentication": 1.5,
-            "payment": 2.0,
-            "real-time": 1.5,
-            "analytics": 1.0,
-            "report": 1.0,
-        }
-
-        text_lower = description.lower()
-        for keyword, value in complex_keywords.items():
+        if text_lower is None:
+            text_lower = description.lower()
+        for keyword, value in _COMPLEX_KEYWORDS:
             if keyword in text_lower:
                 keyword_complexity += value
 
         total = base_complexity + criteria_bonus + keyword_complexity
         return min(10.0, max(1.0, total))
 
+    def _complexity_from_factors(self, factors: List[str], ac_len: int, desc_len: int) -> float:
+        """Estimate feature complexity (0-10 scale) from advanced NLP complexity factors."""
+        factor_complexity = 0.0
+        for factor in factors:
+            for prefix, weight in _FACTOR_WEIGHTS:
+                if factor.startswith(prefix):
+                    factor_complexity += weight
+                    break
+
+        total = min(desc_len / 100, 5.0) + ac_len * 0.5 + factor_complexity
+        return min(10.0, max(1.0, total))
+
     def _complexity_level(self, score: float) -> str:
         """Convert complexity score to level."""
         if score <= 3:
@@ -362,22 +555,26 @@ class FeatureBreakdownModel:
             return "medium"
         return "high"
 
-    def _identify_components(self, description: str) -> List[str]:
+    @staticmethod
+    def _split_sentences(description: str) -> List[str]:
+        """Split a description into stripped sentences (empty ones included)."""
+        return [sentence.strip() for sentence in _SENT_SPLIT.split(description)]
+
+    def _identify_components(self, description: str, sentences: Optional[List[str]] = None) -> List[str]:
         """Identify functional components from description."""
-        sentences = [sentence.strip() for sentence in re.split(r"[.!?]\s+", description) if sentence.strip()]
-        # Group related sentences
-        components = []
-        current_component = ""
+        if sentences is None:
+            sentences = self._split_sentences(description)
+        # Group related sentences: each long sentence opens a component and the
+        # short ones after it join it, collected as lists and joined once
+        groups: List[List[str]] = []
         for sentence in sentences:
-            if len(sentence) > 30:
-                if current_component:
-                    components.append(current_component)
-                current_component = sentence
+            if not sentence:
+                continue
+            if len(sentence) > 30 or not groups:
+                groups.append([sentence])
             else:
-                current_component += " " + sentence if current_component else sentence
-        if current_component:
-            components.append(current_component)
-        return components or [description]
+                groups[-1].append(sentence)
+        return [" ".join(group) for group in groups] or [description]
 
     def _group_requirements_into_stories(self, requirements: List[str], description: str) -> List[str]:
         """Group requirements into logical story candidates."""
@@ -393,39 +590,31 @@ class FeatureBreakdownModel:
 
         return stories[:6] if stories else self._identify_components(description)
 
-    def _select_persona_for_story(self, story_text: str, personas: List[str]) -> str:
+    def _select_persona_for_story(self, story_text: str, personas: List[str], text_lower: Optional[str] = None) -> str:
         """Select appropriate persona for a story."""
-        text = story_text.lower()
-        if "admin" in text or "administrator" in text:
+        text = text_lower if text_lower is not None else story_text.lower()
+        # "administrator" contains "admin", so one check covers both
+        if "admin" in text:
             return "admin" if "admin" in personas else personas[0] if personas else "user"
         return personas[0] if personas else "user"
 
-    def _extract_action_from_text(self, text: str) -> str:
+    def _extract_action_from_text(self, text: str, text_lower: Optional[str] = None) -> str:
         """Extract action verb and object from text."""
-        verbs = ["create", "update", "delete", "view", "manage", "configure", "access", "edit", "upload", "download"]
-        text_lower = text.lower()
-        for verb in verbs:
-            if verb in text_lower:
-                # Extract object after verb
-                parts = text_lower.split(verb, 1)
-                if len(parts) > 1:
-                    object_part = parts[1].strip().split()[0:3]
-                    return f"{verb} {' '.join(object_part)}"
-                return f"{verb} items"
+        if text_lower is None:
+            text_lower = text.lower()
+        for verb in _ACTION_VERBS:
+            position = text_lower.find(verb)
+            if position >= 0:
+                # Object: up to three words right after the verb, without splitting the whole tail
+                object_part = text_lower[position + len(verb):].split(None, 3)[:3]
+                return f"{verb} {' '.join(object_part)}"
         return "perform actions"
 
-    def _extract_benefit_from_text(self, text: str, description: str) -> str:
+    def _extract_benefit_from_text(self, text: str, description: str, text_lower: Optional[str] = None) -> str:
         """Extract benefit or goal from text."""
-        benefit_keywords = {
-            "efficient": "I can work more efficiently",
-            "quick": "I can complete tasks quickly",
-            "easy": "I can use the system easily",
-            "secure": "My data is secure",
-            "accurate": "I get accurate information",
-        }
-
-        text_lower = text.lower()
-        for keyword, benefit in benefit_keywords.items():
+        if text_lower is None:
+            text_lower = text.lower()
+        for keyword, benefit in _BENEFIT_KEYWORDS:
             if keyword in text_lower:
                 return benefit
 
@@ -440,8 +629,8 @@ class FeatureBreakdownModel:
 
     def _generate_story_title(self, text: str, index: int) -> str:
         """Generate a concise story title."""
-        # Extract key words
-        words = text.split()
+        # Extract key words; only the first six matter, so stop splitting after them
+        words = text.split(None, 6)
         if len(words) <= 5:
             return " ".join(words).title()
         # Take first few meaningful words
@@ -449,9 +638,10 @@ class FeatureBreakdownModel:
         title = " ".join(key_words[:4]).title()
         return title if title else f"Story {index}"
 
-    def _determine_priority(self, points: int, text: str) -> str:
+    def _determine_priority(self, points: int, text: str, text_lower: Optional[str] = None) -> str:
         """Determine story priority."""
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         if "critical" in text_lower or "urgent" in text_lower or points >= 13:
             return "critical"
         if points >= 8 or "important" in text_lower:
@@ -460,39 +650,32 @@ class FeatureBreakdownModel:
             return "medium"
         return "low"
 
-    def _extract_ui_component(self, text: str) -> str:
+    def _extract_ui_component(self, text: str, text_lower: Optional[str] = None) -> str:
         """Extract UI component name from text."""
-        ui_keywords = {
-            "form": "form",
-            "page": "page",
-            "modal": "modal",
-            "dashboard": "dashboard",
-            "list": "list view",
-            "table": "table",
-        }
-        text_lower = text.lower()
-        for keyword, component in ui_keywords.items():
+        if text_lower is None:
+            text_lower = text.lower()
+        for keyword, component in _UI_KEYWORDS:
             if keyword in text_lower:
                 return component
         return "interface"
 
     def _extract_entity(self, text: str) -> str:
         """Extract main entity from text."""
-        words = text.split()
-        # Look for nouns (capitalized words or common entities)
-        entities = [w for w in words if w[0].isupper() and len(w) > 3]
-        return entities[0].lower() if entities else "resource"
-
-    def generate_acceptance_criteria(self, story_text: str, description: str) -> List[str]:
-        """Generate acceptance criteria for a story."""
-        criteria = [
-            "System validates all inputs correctly",
-            "User receives clear feedback on actions",
-            "Error messages are helpful and actionable",
-        ]
-
-        text_lower = story_text.lower()
-        description_lower = description.lower()
+        # Look for nouns (capitalized words or common entities); the first one wins
+        entity = next((w for w in text.split() if len(w) > 3 and w[0].isupper()), None)
+        return entity.lower() if entity else "resource"
+
+    def generate_acceptance_criteria(
+        self, story_text: str, description: str, text_lower: Optional[str] = None
+    ) -> List[str]:
+        """
+        Generate acceptance criteria for a story.
+        ``text_lower`` may pass in an already lowercased story text.
+        """
+        criteria = list(_BASE_CRITERIA)
+
+        if text_lower is None:
+            text_lower = story_text.lower()
 
         if "authentication" in text_lower or "login" in text_lower:
             criteria.append("Authentication is secure and follows best practices")
@@ -510,23 +693,22 @@ class FeatureBreakdownModel:
         return criteria[:5]  # Limit to 5 criteria
 
     def _allocate_to_sprints(self, stories: List[Dict], capacity: int = 20) -> List[Dict]:
-        allocation = []
-        sprint_points = 0
-        sprint_stories = []
-        sprint_number = 1
-
-        for idx, story in enumerate(stories):
-            points = story["estimated_points"]
-            if sprint_points + points > capacity:
-                allocation.append({"sprint": sprint_number, "stories": [s["title"] for s in sprint_stories]})
-                sprint_number += 1
-                sprint_points = 0
-                sprint_stories = []
-            sprint_stories.append(story)
-            sprint_points += points
-
-        if sprint_stories:
-            allocation.append({"sprint": sprint_number, "stories": [s["title"] for s in sprint_stories]})
+        if not stories:
+            return []
+
+        if _pack_sprints_jit is not None:
+            points = np.fromiter((story["estimated_points"] for story in stories), dtype=np.float64, count=len(stories))
+            sprint_array = np.empty(len(stories), dtype=np.int64)
+            sprint_count = _pack_sprints_jit(points, float(capacity), sprint_array)
+            sprint_of = sprint_array.tolist()
+        else:
+            # Interpreted, per-element indexing is cheaper on lists than on NumPy arrays
+            sprint_of = [0] * len(stories)
+            sprint_count = _pack_sprints([story["estimated_points"] for story in stories], capacity, sprint_of)
+
+        # A story too big for an empty sprint still closes it, leaving that sprint empty
+        allocation = [{"sprint": number, "stories": []} for number in range(1, sprint_count + 1)]
+        for story, number in zip(stories, sprint_of):
+            allocation[number - 1]["stories"].append(story["title"])
 
         return allocation
-
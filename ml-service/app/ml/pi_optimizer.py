@@ -1,9 +1,108 @@
-from typing import Dict, List, Any
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple
 import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Feature priority -> weight in its priority score; unknown priorities weigh as medium
+PRIORITY_WEIGHTS = {"critical": 10, "high": 7, "medium": 4, "low": 1}
+
+
+def _place_features(points, capacity, dep_indptr, dep_indices, recordable, min_remaining, sprint_of, allocated) -> None:
+    """
+    Greedy placement over dense indices: features in priority order, sprints in
+    order. A feature goes to the earliest sprint already holding one of its
+    dependencies that has room, else the first sprint with room, else sprint 0
+    (overloaded). Only placements into ``recordable`` sprints count. Fills
+    ``sprint_of`` (-1 = unplaced) and ``allocated`` in place.
+    ``min_remaining[i]`` is the smallest points value from feature ``i`` on.
+    """
+    n_sprints = len(capacity)
+    # Allocations only grow, so a sprint that cannot fit the smallest feature still
+    # to place never will; first_open moves past such sprints for good
+    first_open = 0
+    for feature in range(len(points)):
+        feature_points = points[feature]
+        best = -1
+        for edge in range(dep_indptr[feature], dep_indptr[feature + 1]):
+            sprint = sprint_of[dep_indices[edge]]
+            if sprint < 0 or (best >= 0 and sprint >= best):
+                continue
+            if allocated[sprint] + feature_points <= capacity[sprint]:
+                best = sprint
+
+        if best < 0:
+            while first_open < n_sprints and allocated[first_open] + min_remaining[feature] > capacity[first_open]:
+                first_open += 1
+            for sprint in range(first_open, n_sprints):
+                if allocated[sprint] + feature_points <= capacity[sprint]:
+                    best = sprint
+                    break
+
+        if best < 0 and n_sprints > 0:
+            best = 0
+        if best >= 0 and recordable[best]:
+            sprint_of[feature] = best
+            allocated[best] += feature_points
+
+
+# Compiled once per process (cached on disk) when Numba is installed
+_place_features_jit = numba.njit(cache=True)(_place_features) if NUMBA_AVAILABLE else None
+
+
+@dataclass
+class SprintFrame:
+    """
+    Column-oriented view of a PI's sprints, one row per distinct sprint id in
+    order of first appearance. Sprints sharing an id share capacity and
+    allocation: a row keeps the first such sprint (for its name) and the
+    capacity of the last, as a dict keyed by id would. ``total_capacity`` sums
+    every input sprint, duplicates included.
+    """
+
+    ids: List[str]
+    sprints: List[Dict[str, Any]]
+    capacities: List[Any]
+    capacity: np.ndarray
+    total_capacity: Any
+
+    @classmethod
+    def from_sprints(cls, sprints: List[Dict[str, Any]]) -> "SprintFrame":
+        row_of: Dict[str, int] = {}
+        first_sprints: List[Dict[str, Any]] = []
+        capacities: List[Any] = []
+        total_capacity = 0
+        for sprint in sprints:
+            sprint_id = str(sprint.get("id", ""))
+            capacity = sprint.get("capacity", 0) or 0
+            total_capacity += capacity
+            row = row_of.get(sprint_id)
+            if row is None:
+                row_of[sprint_id] = len(first_sprints)
+                first_sprints.append(sprint)
+                capacities.append(capacity)
+            else:
+                capacities[row] = capacity
+        return cls(
+            ids=list(row_of),
+            sprints=first_sprints,
+            capacities=capacities,
+            capacity=np.asarray(capacities, dtype=np.float64),
+            total_capacity=total_capacity,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
 
 class PIOptimizer:
     """
@@ -39,14 +138,20 @@ class PIOptimizer:
         # Sort features by priority and dependencies
         sorted_features = self._sort_features_by_priority(features, priority_scores, dependency_graph)
         
-        # Allocate features to sprints
-        assignments = self._allocate_features_to_sprints(sorted_features, sprints, dependency_graph)
+        # Index sprints once (ids, capacities, totals); later stages address them by
+        # row and never walk the sprint list again
+        sprint_frame = SprintFrame.from_sprints(sprints)
+
+        # Allocate features to sprints; the per-sprint totals feed metrics and overload checks
+        assignments, allocated, assigned_rows = self._allocate_features_to_sprints(
+            sorted_features, sprint_frame, dependency_graph
+        )
         
         # Calculate metrics
-        metrics = self._calculate_metrics(assignments, sprints, features)
+        metrics = self._calculate_metrics(sprint_frame, allocated, features)
         
         # Check for overloads
-        warnings = self._check_overloads(assignments, sprints)
+        warnings = self._check_overloads(sprint_frame, allocated, assigned_rows)
         
         return {
             "assignments": assignments,
@@ -77,23 +182,25 @@ class PIOptimizer:
 
     def _calculate_priority_scores(self, features: List[Dict]) -> Dict[str, float]:
         """Calculate priority scores based on business value and points."""
-        scores = {}
-        priority_weights = {"critical": 10, "high": 7, "medium": 4, "low": 1}
-        
-        for feature in features:
-            feature_id = str(feature.get("id", ""))
-            priority = feature.get("priority", "medium").lower()
-            points = feature.get("points", 0) or feature.get("estimatedStoryPoints", 0) or 0
-            business_value = feature.get("businessValue", 5) or 5
-            
-            # Score = priority weight * business value / (points + 1)
-            # Higher priority and business value = higher score
-            # Lower points = higher score (easier to complete)
-            priority_weight = priority_weights.get(priority, 4)
-            score = (priority_weight * business_value) / (points + 1)
-            scores[feature_id] = score
-        
-        return scores
+        priority_weights = PRIORITY_WEIGHTS
+        weights = np.fromiter(
+            (priority_weights.get(f.get("priority", "medium").lower(), 4) for f in features),
+            dtype=np.float64,
+            count=len(features),
+        )
+        business_values = np.asarray([f.get("businessValue", 5) or 5 for f in features], dtype=np.float64)
+        points = np.asarray(
+            [f.get("points", 0) or f.get("estimatedStoryPoints", 0) or 0 for f in features], dtype=np.float64
+        )
+
+        # Score = priority weight * business value / (points + 1)
+        # Higher priority and business value = higher score
+        # Lower points = higher score (easier to complete)
+        # float64 gives the same values as the scalar formula; -1 points score inf
+        with np.errstate(divide="ignore"):
+            scores = weights * business_values / (points + 1)
+
+        return dict(zip((str(f.get("id", "")) for f in features), scores.tolist()))
 
     def _sort_features_by_priority(
         self,
@@ -101,132 +208,230 @@ class PIOptimizer:
         priority_scores: Dict[str, float],
         dependency_graph: Dict[str, List[str]],
     ) -> List[Dict]:
-        """Sort features considering dependencies and priority."""
-        # Topological sort considering dependencies
-        sorted_list = []
-        visited = set()
-        temp_visited = set()
-        
-        def visit(feature_id: str):
-            if feature_id in temp_visited:
-                return  # Circular dependency, skip
-            if feature_id in visited:
-                return
-            
-            temp_visited.add(feature_id)
-            
-            # Visit dependencies first
-            for dep_id in dependency_graph.get(feature_id, []):
-                visit(dep_id)
-            
-            temp_visited.remove(feature_id)
-            visited.add(feature_id)
-            
-            # Find feature and add to sorted list
-            feature = next((f for f in features if str(f.get("id", "")) == feature_id), None)
-            if feature:
-                sorted_list.append(feature)
-        
-        # Sort all features by priority score first
-        feature_ids = sorted(
-            [str(f.get("id", "")) for f in features],
-            key=lambda x: priority_scores.get(x, 0),
-            reverse=True,
+        """
+        Sort features considering dependencies and priority: a feature comes after
+        the features it depends on, and among features whose dependencies are all
+        placed the highest priority score goes first (Kahn's algorithm on a heap).
+        Features in a dependency cycle are placed together, by priority, once
+        everything the cycle depends on is placed.
+        """
+        # Unique feature ids, highest priority first (stable for equal scores); the rank
+        # doubles as the heap key. float64 keeps scores that float32 would merge apart.
+        all_ids = [str(f.get("id", "")) for f in features]
+        scores = np.fromiter(
+            (priority_scores.get(feature_id, 0) for feature_id in all_ids), dtype=np.float64, count=len(all_ids)
         )
-        
-        # Visit in priority order
-        for feature_id in feature_ids:
-            if feature_id not in visited:
-                visit(feature_id)
-        
+        ordered_ids = list(dict.fromkeys(all_ids[i] for i in np.argsort(-scores, kind="stable").tolist()))
+        rank = {feature_id: i for i, feature_id in enumerate(ordered_ids)}
+        id_to_feature = {}
+        for feature in features:
+            id_to_feature.setdefault(str(feature.get("id", "")), feature)
+
+        # Dependencies by rank; unknown ids and self-dependencies don't block
+        depends_on = []
+        for i, feature_id in enumerate(ordered_ids):
+            depends_on.append([
+                j for j in (rank.get(dep_id) for dep_id in dependency_graph.get(feature_id, []))
+                if j is not None and j != i
+            ])
+
+        # Order the condensation: each component waits for the components it depends on
+        component_of, members = self._condense_scc(depends_on)
+        waiting_on = [0] * len(members)
+        dependents = [[] for _ in members]
+        for i, deps in enumerate(depends_on):
+            component = component_of[i]
+            for j in deps:
+                if component_of[j] != component:
+                    waiting_on[component] += 1
+                    dependents[component_of[j]].append(component)
+
+        # A component is keyed by its best rank, members[c][0]; ascending keys form a valid heap
+        ready = sorted(group[0] for component, group in enumerate(members) if waiting_on[component] == 0)
+        sorted_list = []
+
+        while ready:
+            component = component_of[heapq.heappop(ready)]
+            sorted_list.extend(id_to_feature[ordered_ids[i]] for i in members[component])
+            for dependent in dependents[component]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    heapq.heappush(ready, members[dependent][0])
+
         return sorted_list
 
+    @staticmethod
+    def _condense_scc(adjacency: List[List[int]]) -> Tuple[List[int], List[List[int]]]:
+        """
+        Tarjan's strongly connected components, iteratively. Returns each node's
+        component id and each component's nodes in ascending order.
+        """
+        node_count = len(adjacency)
+        index = [-1] * node_count
+        low = [0] * node_count
+        on_stack = [False] * node_count
+        component_of = [-1] * node_count
+        stack = []
+        counter = 0
+        component_count = 0
+
+        for root in range(node_count):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            while work:
+                node, edge = work[-1]
+                if edge < len(adjacency[node]):
+                    work[-1] = (node, edge + 1)
+                    neighbor = adjacency[node][edge]
+                    if index[neighbor] == -1:
+                        index[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack[neighbor] = True
+                        work.append((neighbor, 0))
+                    elif on_stack[neighbor] and index[neighbor] < low[node]:
+                        low[node] = index[neighbor]
+                    continue
+
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = component_count
+                        if member == node:
+                            break
+                    component_count += 1
+
+        members = [[] for _ in range(component_count)]
+        for node, component in enumerate(component_of):
+            members[component].append(node)
+        return component_of, members
+
     def _allocate_features_to_sprints(
         self,
         sorted_features: List[Dict],
-        sprints: List[Dict],
+        sprint_frame: SprintFrame,
         dependency_graph: Dict[str, List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Allocate features to sprints using greedy algorithm."""
+    ) -> Tuple[List[Dict[str, Any]], List[Any], List[int]]:
+        """
+        Allocate features to sprints using greedy algorithm.
+        Returns the assignments, the points allocated per sprint row, and the rows
+        that received features in order of their first assignment.
+        """
         assignments = []
-        sprint_capacities = {sprint["id"]: sprint.get("capacity", 0) or 0 for sprint in sprints}
-        sprint_allocated = {sprint["id"]: 0 for sprint in sprints}
-        feature_to_sprint = {}
-        
-        for feature in sorted_features:
-            feature_id = str(feature.get("id", ""))
-            points = feature.get("points", 0) or feature.get("estimatedStoryPoints", 0) or 0
-            
-            # Find best sprint (considering dependencies and capacity)
-            best_sprint = None
-            best_sprint_id = None
-            
-            # Check if feature has dependencies
-            dependencies = dependency_graph.get(feature_id, [])
-            dependency_sprints = [
-                feature_to_sprint.get(dep_id) for dep_id in dependencies if dep_id in feature_to_sprint
-            ]
-            
-            # Try to place in same sprint as dependencies, or next available
-            for sprint in sprints:
-                sprint_id = str(sprint.get("id", ""))
-                capacity = sprint_capacities.get(sprint_id, 0)
-                allocated = sprint_allocated.get(sprint_id, 0)
-                
-                # Check if sprint has capacity
-                if allocated + points <= capacity:
-                    # Prefer sprint with dependencies
-                    if sprint_id in dependency_sprints:
-                        best_sprint = sprint
-                        best_sprint_id = sprint_id
-                        break
-                    # Or first available sprint
-                    elif best_sprint is None:
-                        best_sprint = sprint
-                        best_sprint_id = sprint_id
-            
-            # If no sprint found, assign to first sprint anyway (will show as overloaded)
-            if best_sprint is None and sprints:
-                best_sprint = sprints[0]
-                best_sprint_id = str(sprints[0].get("id", ""))
-            
-            if best_sprint:
-                assignments.append({
-                    "featureId": feature_id,
-                    "featureTitle": feature.get("title", ""),
-                    "sprintId": best_sprint_id,
-                    "sprintName": best_sprint.get("name", ""),
-                    "points": points,
-                    "priority": feature.get("priority", "medium"),
-                })
-                
-                feature_to_sprint[feature_id] = best_sprint_id
-                sprint_allocated[best_sprint_id] = sprint_allocated.get(best_sprint_id, 0) + points
-        
-        return assignments
+
+        # Dense feature indices in priority order; each feature's distinct dependencies
+        # as CSR, so the kernel checks every dependency sprint once
+        feature_ids = [str(feature.get("id", "")) for feature in sorted_features]
+        feature_points = [
+            feature.get("points", 0) or feature.get("estimatedStoryPoints", 0) or 0 for feature in sorted_features
+        ]
+        feature_position = {feature_id: i for i, feature_id in enumerate(feature_ids)}
+        dep_indptr = [0]
+        dep_indices = []
+        for feature_id in feature_ids:
+            dep_indices.extend(dict.fromkeys(
+                feature_position[dep_id] for dep_id in dependency_graph.get(feature_id, []) if dep_id in feature_position
+            ))
+            dep_indptr.append(len(dep_indices))
+
+        # A falsy (empty) sprint dict takes no assignments, as before
+        recordable = [bool(sprint) for sprint in sprint_frame.sprints]
+        # Smallest points among the features still to place. The skip-ahead cursor is
+        # only sound while allocations cannot shrink, so it is -inf while a feature
+        # with negative points remains.
+        min_remaining = [0] * len(feature_points)
+        running = float("inf")
+        for i in range(len(feature_points) - 1, -1, -1):
+            running = min(running, feature_points[i])
+            min_remaining[i] = running
+        if min_remaining and min_remaining[0] < 0:
+            min_remaining = [value if value >= 0 else float("-inf") for value in min_remaining]
+
+        if _place_features_jit is not None:
+            # Integer points keep integer totals; anything else is summed as float64
+            points_array = np.asarray(feature_points)
+            if points_array.dtype.kind not in "iu":
+                points_array = points_array.astype(np.float64)
+            # Index arrays are int32; points and capacity keep full width (fractional, summed)
+            sprint_of = np.full(len(feature_ids), -1, dtype=np.int32)
+            allocated = np.zeros(len(sprint_frame), dtype=points_array.dtype)
+            _place_features_jit(
+                points_array,
+                sprint_frame.capacity,
+                np.asarray(dep_indptr, dtype=np.int32),
+                np.asarray(dep_indices, dtype=np.int32),
+                np.asarray(recordable, dtype=np.bool_),
+                np.asarray(min_remaining, dtype=np.float64),
+                sprint_of,
+                allocated,
+            )
+            sprint_of = sprint_of.tolist()
+            allocated = allocated.tolist()
+        else:
+            sprint_of = [-1] * len(feature_ids)
+            allocated = [0] * len(sprint_frame)
+            _place_features(
+                feature_points,
+                sprint_frame.capacities,
+                dep_indptr,
+                dep_indices,
+                recordable,
+                min_remaining,
+                sprint_of,
+                allocated,
+            )
+
+        for feature, feature_id, points, row in zip(sorted_features, feature_ids, feature_points, sprint_of):
+            if row < 0:
+                continue
+            assignments.append({
+                "featureId": feature_id,
+                "featureTitle": feature.get("title", ""),
+                "sprintId": sprint_frame.ids[row],
+                "sprintName": sprint_frame.sprints[row].get("name", ""),
+                "points": points,
+                "priority": feature.get("priority", "medium"),
+            })
+
+        assigned_rows = list(dict.fromkeys(row for row in sprint_of if row >= 0))
+        return assignments, allocated, assigned_rows
 
     def _calculate_metrics(
         self,
-        assignments: List[Dict],
-        sprints: List[Dict],
+        sprint_frame: SprintFrame,
+        allocated: List[Any],
         features: List[Dict],
     ) -> Dict[str, Any]:
         """Calculate optimization metrics."""
         total_points = sum(f.get("points", 0) or f.get("estimatedStoryPoints", 0) or 0 for f in features)
-        total_capacity = sum(s.get("capacity", 0) or 0 for s in sprints)
-        
+        total_capacity = sprint_frame.total_capacity
+
+        utilization = np.zeros(len(sprint_frame))
+        np.divide(
+            np.asarray(allocated, dtype=np.float64),
+            sprint_frame.capacity,
+            out=utilization,
+            where=sprint_frame.capacity > 0,
+        )
+        utilization *= 100
+
         sprint_utilization = {}
-        for sprint in sprints:
-            sprint_id = str(sprint.get("id", ""))
-            sprint_assignments = [a for a in assignments if a["sprintId"] == sprint_id]
-            allocated = sum(a["points"] for a in sprint_assignments)
-            capacity = sprint.get("capacity", 0) or 0
-            utilization = (allocated / capacity * 100) if capacity > 0 else 0
-            
+        for sprint_id, sprint_allocated, capacity, sprint_util in zip(
+            sprint_frame.ids, allocated, sprint_frame.capacities, utilization.tolist()
+        ):
             sprint_utilization[sprint_id] = {
-                "allocated": allocated,
+                "allocated": sprint_allocated,
                 "capacity": capacity,
-                "utilization": round(utilization, 1),
+                "utilization": round(sprint_util, 1) if capacity > 0 else 0,
             }
         
         overall_utilization = (total_points / total_capacity * 100) if total_capacity > 0 else 0
@@ -239,32 +444,23 @@ class PIOptimizer:
         }
 
     def _check_overloads(
-        self, assignments: List[Dict], sprints: List[Dict]
+        self, sprint_frame: SprintFrame, allocated: List[Any], assigned_rows: List[int]
     ) -> List[Dict[str, Any]]:
         """Check for sprint overloads and return warnings."""
         warnings = []
-        sprint_capacities = {str(s.get("id", "")): s.get("capacity", 0) or 0 for s in sprints}
-        sprint_allocated = {}
         
-        for assignment in assignments:
-            sprint_id = assignment["sprintId"]
-            sprint_allocated[sprint_id] = sprint_allocated.get(sprint_id, 0) + assignment["points"]
-        
-        for sprint_id, allocated in sprint_allocated.items():
-            capacity = sprint_capacities.get(sprint_id, 0)
-            if allocated > capacity:
-                sprint_name = next(
-                    (s.get("name", "") for s in sprints if str(s.get("id", "")) == sprint_id),
-                    sprint_id,
-                )
+        for row in assigned_rows:
+            sprint_allocated = allocated[row]
+            capacity = sprint_frame.capacities[row]
+            if sprint_allocated > capacity:
+                overload = sprint_allocated - capacity
                 warnings.append({
-                    "sprintId": sprint_id,
-                    "sprintName": sprint_name,
-                    "allocated": allocated,
+                    "sprintId": sprint_frame.ids[row],
+                    "sprintName": sprint_frame.sprints[row].get("name", ""),
+                    "allocated": sprint_allocated,
                     "capacity": capacity,
-                    "overload": allocated - capacity,
-                    "severity": "high" if (allocated - capacity) > capacity * 0.2 else "medium",
+                    "overload": overload,
+                    "severity": "high" if overload > capacity * 0.2 else "medium",
                 })
         
         return warnings
-
@@ -0,0 +1,72 @@
+"""
+Process-wide registry of ML model instances.
+Each model is constructed once per worker on first use and shared by every route.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from app.core.config import settings
+from app.ml.embedding_batcher import EmbeddingBatcher, init_embedding_worker
+from app.ml.feature_breakdown import FeatureBreakdownModel
+from app.ml.pi_optimizer import PIOptimizer
+from app.ml.risk_analyzer import RiskAnalyzerModel
+from app.ml.sprint_generator import SprintAutoGenerator
+from app.ml.sprint_planner import SprintPlannerModel
+from app.ml.story_analyzer import StoryAnalyzer
+from app.ml.task_assignment import TaskAssignmentModel
+from app.ml.velocity_forecaster import VelocityForecaster
+
+
+@lru_cache
+def get_story_analyzer() -> StoryAnalyzer:
+    return StoryAnalyzer()
+
+
+@lru_cache
+def get_embedding_batcher() -> EmbeddingBatcher:
+    executor = None
+    if settings.embedding_workers > 0:
+        # spawn, not fork: the parent already holds torch thread pools
+        executor = ProcessPoolExecutor(
+            max_workers=settings.embedding_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_embedding_worker,
+            initargs=(StoryAnalyzer.MODEL_NAME,),
+        )
+    return EmbeddingBatcher(get_story_analyzer().embedder, executor=executor)
+
+
+@lru_cache
+def get_feature_breakdown_model() -> FeatureBreakdownModel:
+    return FeatureBreakdownModel(story_analyzer=get_story_analyzer())
+
+
+@lru_cache
+def get_task_assignment_model() -> TaskAssignmentModel:
+    return TaskAssignmentModel()
+
+
+@lru_cache
+def get_velocity_forecaster() -> VelocityForecaster:
+    return VelocityForecaster()
+
+
+@lru_cache
+def get_sprint_planner() -> SprintPlannerModel:
+    return SprintPlannerModel()
+
+
+@lru_cache
+def get_risk_analyzer() -> RiskAnalyzerModel:
+    return RiskAnalyzerModel()
+
+
+@lru_cache
+def get_pi_optimizer() -> PIOptimizer:
+    return PIOptimizer()
+
+
+@lru_cache
+def get_sprint_generator() -> SprintAutoGenerator:
+    return SprintAutoGenerator()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, List
 
 from app.utils.logger import get_logger
@@ -12,19 +13,7 @@ class RiskAnalyzerModel:
     """
 
     def analyze_project_risks(self, project_id: str) -> Dict[str, any]:
-        # Placeholder: in reality, fetch data from DB
-        sprint_risks = [
-            self._risk_item(
-                "CAPACITY_OVERLOAD",
-                75,
-                "Team operating near capacity while handling complex features.",
-                affected=["Project"],
-                mitigation=[
-                    "Split large features across sprints",
-                    "Introduce buffer for critical tasks",
-                ],
-            )
-        ]
+        sprint_risks = self._project_risk_factors(project_id)
 
         bottlenecks = self.detect_bottlenecks("project", project_id)
         delay_prediction = self.predict_delays("project", project_id)
@@ -38,6 +27,28 @@ class RiskAnalyzerModel:
             "predictions": delay_prediction,
         }
 
+    def get_high_severity_alerts(self, project_id: str, threshold: int = 60) -> List[Dict]:
+        """
+        Return only the project risk factors scoring at or above ``threshold``, without
+        running the bottleneck and delay analyses that a full project report needs.
+        """
+        return [risk for risk in self._project_risk_factors(project_id) if risk["score"] >= threshold]
+
+    def _project_risk_factors(self, project_id: str) -> List[Dict]:
+        # Placeholder: in reality, fetch data from DB
+        return [
+            self._risk_item(
+                "CAPACITY_OVERLOAD",
+                75,
+                "Team operating near capacity while handling complex features.",
+                affected=["Project"],
+                mitigation=[
+                    "Split large features across sprints",
+                    "Introduce buffer for critical tasks",
+                ],
+            )
+        ]
+
     def analyze_sprint_risks(self, sprint_id: str) -> Dict[str, any]:
         # Example data; would query DB for actual metrics
         team_capacity = 400
@@ -185,6 +196,7 @@ class RiskAnalyzerModel:
         }
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def _risk_level(score: int) -> str:
         if score <= 30:
             return "low"
@@ -4,7 +4,6 @@ import math
 from typing import Dict, List
 
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
 
 from app.core.database import fetch_training_data
 from app.utils.logger import get_logger
@@ -20,11 +19,41 @@ class StoryAnalyzer:
     MODEL_NAME = "all-MiniLM-L6-v2"
 
     def __init__(self):
+        # Imported here: sentence-transformers pulls in torch and transformers,
+        # which importing this module alone should not pay for
+        from sentence_transformers import SentenceTransformer
+
         self.embedder = SentenceTransformer(self.MODEL_NAME)
         self.training_cache: List[Dict] = []
 
+    def warmup(self) -> None:
+        """Run one encode so the first request does not pay for lazy model setup."""
+        self.embedder.encode("warmup")
+
+    # Descriptions per forward pass when analyzing several stories at once
+    ENCODE_BATCH_SIZE = 32
+
     def analyze_story(self, title: str, description: str, acceptance_criteria: List[str]) -> Dict[str, any]:
         embedding = self.embedder.encode(description)
+        return self._analyze_embedded(description, acceptance_criteria, embedding)
+
+    def analyze_stories_batch(
+        self, title: str, descriptions: List[str], acceptance_criteria: List[str]
+    ) -> List[Dict[str, any]]:
+        """Analyze several stories, embedding all descriptions in one encode call."""
+        if not descriptions:
+            return []
+        embeddings = self.embedder.encode(
+            descriptions, batch_size=self.ENCODE_BATCH_SIZE, convert_to_numpy=True
+        )
+        return [
+            self._analyze_embedded(description, acceptance_criteria, embedding)
+            for description, embedding in zip(descriptions, embeddings)
+        ]
+
+    def _analyze_embedded(
+        self, description: str, acceptance_criteria: List[str], embedding: np.ndarray
+    ) -> Dict[str, any]:
         complexity_breakdown = self._calculate_complexity_factors(description, acceptance_criteria)
         score = np.mean(list(complexity_breakdown.values())) * 1.2
         score = min(10.0, max(1.0, score))
@@ -73,6 +102,8 @@ class StoryAnalyzer:
         return requirements or ["General functional requirements inferred"]
 
     def find_similar_stories(self, embedding: np.ndarray, top_k: int = 3) -> List[Dict]:
+        from sentence_transformers import util
+
         if not self.training_cache:
             self.training_cache = fetch_training_data("stories", limit=100)
 
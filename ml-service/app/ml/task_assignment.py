@@ -1,6 +1,7 @@
 import math
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import joblib
 import numpy as np
@@ -16,6 +17,114 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Weights of the heuristic components, in the column order produced by
+# TaskAssignmentModel._score_team: skill match, performance, workload,
+# time pattern, complexity alignment, collaboration.
+SCORE_WEIGHTS = np.array([0.3, 0.25, 0.2, 0.1, 0.1, 0.05])
+
+
+def blend_confidence(score_components: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """
+    Combine heuristic score components with model probabilities into a confidence
+    per row, for all candidate pairs at once.
+    """
+    weighted = score_components @ SCORE_WEIGHTS
+    # Very sparse data - use a conservative baseline (0.35 to 0.41) so that
+    # recommendations stay useful even with limited data
+    sparse = (weighted < 0.2) & (probabilities < 0.2)
+    confidence = np.where(sparse, 0.35 + weighted * 0.3, 0.6 * weighted + 0.4 * probabilities)
+    return np.clip(confidence, 0.3, 1.0)
+
+
+COMPLEXITY_ALIGNMENT_MAP = {"low": 0.3, "medium": 0.6, "high": 0.9}
+
+
+def _as_float(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _filled(column: np.ndarray, default: float) -> np.ndarray:
+    return np.where(np.isnan(column), default, column)
+
+
+@dataclass
+class TeamFrame:
+    """
+    Column-oriented view of a team: one array per numeric member field instead of a
+    list of dicts. Missing or null fields are stored as NaN so each consumer can apply
+    its own default. Member skills are packed into one bitset row per member over the
+    team's skill vocabulary, so skill overlap is a bitwise AND plus a popcount.
+    """
+
+    user_ids: np.ndarray
+    skill_vocab: Dict[str, int]
+    skill_bits: np.ndarray
+    skill_count: np.ndarray
+    capacity: np.ndarray
+    availability: np.ndarray
+    current_workload: np.ndarray
+    velocity: np.ndarray
+    completion_rate: np.ndarray
+    on_time_delivery: np.ndarray
+    quality_score: np.ndarray
+    time_accuracy: np.ndarray
+    collaboration_index: np.ndarray
+    time_tracking_consistency: np.ndarray
+    time_logging_variance: np.ndarray
+    complexity_handled: np.ndarray
+
+    NUMERIC_FIELDS = (
+        "capacity",
+        "availability",
+        "current_workload",
+        "velocity",
+        "completion_rate",
+        "on_time_delivery",
+        "quality_score",
+        "time_accuracy",
+        "collaboration_index",
+        "time_tracking_consistency",
+        "time_logging_variance",
+    )
+
+    @classmethod
+    def from_members(cls, members: List[Dict]) -> "TeamFrame":
+        columns = {
+            field: np.array([_as_float(member.get(field)) for member in members], dtype=np.float64)
+            for field in cls.NUMERIC_FIELDS
+        }
+        skill_vocab: Dict[str, int] = {}
+        member_skills = [
+            [skill_vocab.setdefault(skill.lower(), len(skill_vocab)) for skill in member.get("skills", [])]
+            for member in members
+        ]
+        membership = np.zeros((len(members), len(skill_vocab)), dtype=bool)
+        for row, indices in enumerate(member_skills):
+            membership[row, indices] = True
+        return cls(
+            user_ids=np.array([member.get("user_id") or member.get("_id") for member in members], dtype=object),
+            skill_vocab=skill_vocab,
+            skill_bits=np.packbits(membership, axis=1),
+            skill_count=np.array([len(member.get("skills", [])) for member in members], dtype=np.float64),
+            complexity_handled=np.array(
+                [
+                    COMPLEXITY_ALIGNMENT_MAP.get(member.get("complexity_handled", "medium"), 0.6)
+                    for member in members
+                ],
+                dtype=np.float64,
+            ),
+            **columns,
+        )
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def skill_bitset(self, skills: frozenset) -> np.ndarray:
+        """Pack ``skills`` into a bitset over this team's vocabulary; unknown skills are dropped."""
+        membership = np.zeros(len(self.skill_vocab), dtype=bool)
+        membership[[self.skill_vocab[skill] for skill in skills if skill in self.skill_vocab]] = True
+        return np.packbits(membership)
+
 
 class TaskAssignmentModel:
     """
@@ -171,16 +280,66 @@ class TaskAssignmentModel:
     # -------------------------------------------------------------------------
     # Recommendation pipeline
     # -------------------------------------------------------------------------
+    def warmup(self) -> None:
+        """Score one dummy pair end to end so the first request runs at steady-state speed."""
+        self.get_recommendations(
+            {"required_skills": ["python"], "estimated_story_points": 1},
+            [{"user_id": "warmup", "skills": ["python"], "capacity": 40}],
+        )
+
     def get_recommendations(self, task: Dict, available_developers: List[Dict], top_n: int = 3) -> Dict:
-        recommendations: List[TaskAssignmentRecommendation] = []
         if not available_developers:
             return {"recommendations": []}
+        return self.get_recommendations_batch([task], [available_developers], top_n=top_n)[0]
 
-        for developer in available_developers:
-            rec = self._score_developer(task, developer)
-            if rec:
-                recommendations.append(rec)
+    def get_recommendations_batch(
+        self, tasks: List[Dict], team_members_per_task: List[List[Dict]], top_n: int = 3
+    ) -> List[Dict]:
+        """
+        Score every (task, developer) pair with a single model call and return one
+        recommendation payload per task, in the same order as ``tasks``.
+        """
+        team_scores: List[Dict[str, np.ndarray]] = []
+        offsets: List[int] = []
+        total = 0
+
+        for task, developers in zip(tasks, team_members_per_task):
+            scored = self._score_team(task, TeamFrame.from_members(developers))
+            team_scores.append(scored)
+            total += len(developers)
+            offsets.append(total)
+
+        if total:
+            probabilities = self._predict_probabilities(np.vstack([scored["features"] for scored in team_scores]))
+            confidences = blend_confidence(np.vstack([scored["scores"] for scored in team_scores]), probabilities)
+        else:
+            confidences = np.zeros(0)
+
+        results = []
+        start = 0
+        for task, developers, scored, end in zip(tasks, team_members_per_task, team_scores, offsets):
+            recommendations = [
+                self._build_recommendation(
+                    task,
+                    developer,
+                    skill_match=float(scores[0]),
+                    performance_score=float(scores[1]),
+                    workload_score=float(scores[2]),
+                    utilization=float(utilization),
+                    confidence=float(confidence),
+                )
+                for developer, scores, utilization, confidence in zip(
+                    developers, scored["scores"], scored["utilization"], confidences[start:end]
+                )
+            ]
+            results.append(self._format_recommendations(recommendations, developers, top_n))
+            start = end
+
+        return results
 
+    def _format_recommendations(
+        self, recommendations: List[TaskAssignmentRecommendation], available_developers: List[Dict], top_n: int
+    ) -> Dict:
         recommendations.sort(key=lambda r: r.confidence, reverse=True)
         top_recs = recommendations[:top_n]
 
@@ -203,7 +362,7 @@ class TaskAssignmentModel:
 
         return {"recommendations": payload}
 
-    def _score_developer(self, task: Dict, developer: Dict) -> Optional[TaskAssignmentRecommendation]:
+    def _required_skills(self, task: Dict) -> List[str]:
         # Extract required_skills from task, or infer from description if missing
         required_skills = task.get("required_skills", [])
         if not required_skills and task.get("description"):
@@ -219,54 +378,96 @@ class TaskAssignmentModel:
             if found_skills:
                 required_skills = found_skills
                 logger.debug(f"Extracted skills from task description: {found_skills}")
-        
+        return required_skills
+
+    def _score_team(self, task: Dict, team: TeamFrame) -> Dict[str, np.ndarray]:
+        """
+        Compute the model feature matrix, the heuristic score components (in
+        SCORE_WEIGHTS order) and the utilization for every member of ``team``.
+        """
         task_complexity = task.get("complexity", "medium")
 
-        skill_match = self.calculate_skill_match(required_skills, developer.get("skills", []))
-        workload_score, utilization, availability = self.calculate_workload_score(developer)
-        performance_score = self.calculate_performance_score(developer)
-        time_pattern_score = self.calculate_time_pattern_score(developer)
-        complexity_alignment = self._calculate_complexity_alignment(task_complexity, developer)
-        collaboration_score = developer.get("collaboration_index", 0.5)
+        skill_match = self._skill_match_scores(self._required_skills(task), team)
+        workload_score, utilization = self._workload_scores(team)
+        performance_score = (
+            _filled(team.completion_rate, 0.5) + _filled(team.on_time_delivery, 0.5) + _filled(team.quality_score, 0.5)
+        ) / 3
+        time_pattern_score = np.clip(
+            _filled(team.time_tracking_consistency, 0.5) - 0.2 * _filled(team.time_logging_variance, 0.3), 0.0, 1.0
+        )
+        task_score = COMPLEXITY_ALIGNMENT_MAP.get(task_complexity, 0.6)
+        complexity_alignment = 1.0 - np.abs(team.complexity_handled - task_score)
+        collaboration_score = _filled(team.collaboration_index, 0.5)
 
-        features = np.array(
+        features = np.column_stack(
             [
                 skill_match,
-                len(developer.get("skills", [])),
+                team.skill_count,
                 utilization,
-                developer.get("capacity", 1),
-                developer.get("velocity", 0.0),
-                developer.get("completion_rate", 0.0),
-                developer.get("time_accuracy", 0.0),
+                _filled(team.capacity, 1),
+                _filled(team.velocity, 0.0),
+                _filled(team.completion_rate, 0.0),
+                _filled(team.time_accuracy, 0.0),
+                collaboration_score,
+                np.full(len(team), self._complexity_to_numeric(task_complexity)),
+            ]
+        )
+        scores = np.column_stack(
+            [
+                skill_match,
+                performance_score,
+                workload_score,
+                time_pattern_score,
+                complexity_alignment,
                 collaboration_score,
-                self._complexity_to_numeric(task_complexity),
             ]
-        ).reshape(1, -1)
-
-        probability = self._predict_probability(features)
-
-        # Weighted scoring combining heuristic components
-        weighted_score = (
-            0.3 * skill_match
-            + 0.25 * performance_score
-            + 0.2 * workload_score
-            + 0.1 * time_pattern_score
-            + 0.1 * complexity_alignment
-            + 0.05 * collaboration_score
         )
 
-        # Improved confidence calculation with better baseline
-        # If we have minimal data, give a reasonable baseline confidence
-        # Otherwise use the weighted formula
-        if weighted_score < 0.2 and probability < 0.2:
-            # Very sparse data - use a conservative baseline (30-50%)
-            # This ensures recommendations are still useful even with limited data
-            baseline_confidence = 0.35 + (weighted_score * 0.3)  # Range: 0.35 to 0.41
-            confidence = min(1.0, max(0.3, baseline_confidence))
-        else:
-            # Normal calculation with improved weighting
-            confidence = min(1.0, max(0.3, 0.6 * weighted_score + 0.4 * probability))
+        return {"features": features, "scores": scores, "utilization": utilization}
+
+    @staticmethod
+    def _skill_match_scores(required_skills: List[str], team: TeamFrame) -> np.ndarray:
+        if not required_skills:
+            # If no required skills specified, give neutral score (0.5) instead of penalizing
+            return np.full(len(team), 0.5)
+        required = frozenset(skill.lower() for skill in required_skills)
+        overlap = np.unpackbits(team.skill_bits & team.skill_bitset(required), axis=1).sum(axis=1)
+        member_skills = np.unpackbits(team.skill_bits, axis=1).sum(axis=1)
+        # Jaccard similarity; members without skills fall through to the 0.2 floor
+        return np.maximum(0.2, overlap / (len(required) + member_skills - overlap))
+
+    @staticmethod
+    def _workload_scores(team: TeamFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized calculate_workload_score over a whole team.
+        """
+        # Use reasonable default capacity if missing (40 story points per sprint)
+        capacity = np.nan_to_num(team.capacity, nan=0.0)
+        availability = np.nan_to_num(team.availability, nan=0.0)
+        capacity = np.where(capacity != 0, capacity, np.where(availability != 0, availability, 40.0))
+        missing = capacity <= 0
+        if missing.any():
+            logger.warning(f"Developers {list(team.user_ids[missing])} have no capacity, using default 40")
+            capacity = np.where(missing, 40.0, capacity)
+        workload = np.nan_to_num(team.current_workload, nan=0.0)
+
+        utilization = workload / capacity
+        score = 1.0 - utilization
+        # heavy penalty for overloaded, slight boost for available capacity
+        score = np.where(utilization >= 0.9, score * 0.2, np.where(utilization <= 0.5, score * 1.2, score))
+        return np.clip(score, 0.0, 1.0), utilization
 
+    def _build_recommendation(
+        self,
+        task: Dict,
+        developer: Dict,
+        *,
+        skill_match: float,
+        performance_score: float,
+        workload_score: float,
+        utilization: float,
+        confidence: float,
+    ) -> TaskAssignmentRecommendation:
         reasoning = self.explain_recommendation(
             task,
             developer,
@@ -294,15 +495,18 @@ class TaskAssignmentModel:
             metadata=metadata,
         )
 
-    def _predict_probability(self, features: np.ndarray) -> float:
+    def _predict_probabilities(self, features: np.ndarray) -> np.ndarray:
+        """
+        Return the assignment success probability for each feature row.
+        """
         if not self.clf or not self.scaler or not self.svd:
             # Fallback to heuristic probability
-            return float(np.mean(features))
+            return features.mean(axis=1)
 
         scaled = self.scaler.transform(features)
         latent = self.svd.transform(scaled)
         matrix = np.hstack([scaled, latent])
-        return float(self.clf.predict_proba(matrix)[0, 1])
+        return self.clf.predict_proba(matrix)[:, 1]
 
     # -------------------------------------------------------------------------
     # Feature calculations
@@ -364,13 +568,6 @@ class TaskAssignmentModel:
         variance = developer.get("time_logging_variance", 0.3)
         return max(0.0, min(1.0, consistency - 0.2 * variance))
 
-    def _calculate_complexity_alignment(self, task_complexity: str, developer: Dict) -> float:
-        complexity_map = {"low": 0.3, "medium": 0.6, "high": 0.9}
-        developer_experience = developer.get("complexity_handled", "medium")
-        dev_score = complexity_map.get(developer_experience, 0.6)
-        task_score = complexity_map.get(task_complexity, 0.6)
-        return 1.0 - abs(dev_score - task_score)
-
     @staticmethod
     def _complexity_to_numeric(value: str) -> float:
         return {"low": 0.2, "medium": 0.5, "high": 0.8}.get(value, 0.5)
@@ -65,6 +65,18 @@ class MLTrainingPipeline:
         self.min_feedback_for_retrain = 50  # Minimum new feedback to trigger retrain
         self.improvement_threshold = 0.02  # 2% improvement required
 
+    def ensure_indexes(self) -> None:
+        """
+        Create the metrics indexes behind the latest-metric lookups: per model type
+        (should_retrain, performance history) and per active model type (model stats).
+        """
+        from pymongo import ASCENDING, DESCENDING, IndexModel
+
+        self.metrics_collection.create_indexes([
+            IndexModel([('model_type', ASCENDING), ('is_active', ASCENDING), ('trained_at', DESCENDING)]),
+            IndexModel([('model_type', ASCENDING), ('trained_at', DESCENDING)]),
+        ])
+
     def should_retrain(self, model_type: str) -> bool:
         """
         Check if model should be retrained based on new feedback.
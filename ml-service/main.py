@@ -1,15 +1,25 @@
+import asyncio
+import gc
+import importlib.util
 import logging
+from contextlib import asynccontextmanager
+from typing import Callable
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from app.api import api_router
 from app.core.config import settings
-from app.core.database import close_mongo_connection, connect_to_mongo
+from app.core.database import close_mongo_connection, connect_to_mongo, ping_database
+from app.ml.advanced_feature_nlp import get_nlp_analyzer
+from app.ml.registry import get_embedding_batcher, get_story_analyzer, get_task_assignment_model
+from app.ml.training_pipeline import training_pipeline
 from app.utils.logger import configure_logging, get_logger
 
 configure_logging(settings.log_level)
@@ -25,11 +35,39 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+async def _startup_step(name: str, func: Callable[[], None]) -> None:
+    try:
+        await run_in_threadpool(func)
+        logger.info("Startup step done: %s", name)
+    except Exception as e:
+        logger.warning(f"Startup step {name} failed, continuing: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Starting ML service")
+    await connect_to_mongo()
+    await asyncio.gather(
+        _startup_step("MongoDB ping", ping_database),
+        _startup_step("model metrics indexes", training_pipeline.ensure_indexes),
+        _startup_step("story analyzer warmup", get_story_analyzer().warmup),
+        _startup_step("task assignment model warmup", get_task_assignment_model().warmup),
+    )
+
+    yield
+
+    logger.info("Shutting down ML service")
+    await get_embedding_batcher().close()
+    await close_mongo_connection()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="AgileSAFe ML Service",
         description="Production-ready FastAPI service powering ML workloads.",
         version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -43,21 +81,37 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router)
 
-    @app.on_event("startup")
-    async def startup_event() -> None:
-        logger.info("Starting ML service")
-        await connect_to_mongo()
+    return app
 
-    @app.on_event("shutdown")
-    async def shutdown_event() -> None:
-        logger.info("Shutting down ML service")
-        await close_mongo_connection()
 
-    return app
+def preload_models() -> None:
+    """
+    Load the heavy NLP models at import time. Under a pre-forking server
+    (gunicorn --preload) this runs once in the master, and the workers share the
+    weight pages copy-on-write instead of each loading their own copy.
+    """
+    try:
+        import torch
+
+        # Forked workers inherit the parent's intra-op pool size; one thread each
+        # keeps N workers from oversubscribing the CPUs.
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+    get_story_analyzer()
+    get_task_assignment_model()
+    get_nlp_analyzer()
+    # Keep the collector from touching (and so copying) the preloaded objects' pages
+    gc.freeze()
+    logger.info("Preloaded ML models for copy-on-write sharing across workers")
 
 
 app = create_app()
 
+if settings.preload_models:
+    preload_models()
+
 
 # Import scheduler to start training pipeline
 try:
@@ -72,6 +126,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=settings.port,
         log_level=settings.log_level.lower(),
+        # uvicorn[standard] ships both; fall back where uvloop is unavailable (Windows)
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
     )
 
 
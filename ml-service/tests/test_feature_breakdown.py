@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+
+from app.ml import feature_breakdown
+from app.ml.feature_breakdown import FeatureBreakdownModel, _pack_sprints
+
+
+def _reference_allocation(stories, capacity=20):
+    """The original list-building allocation loop, kept as the behavioural reference."""
+    allocation = []
+    sprint_points = 0
+    sprint_stories = []
+    sprint_number = 1
+
+    for story in stories:
+        points = story["estimated_points"]
+        if sprint_points + points > capacity:
+            allocation.append({"sprint": sprint_number, "stories": [s["title"] for s in sprint_stories]})
+            sprint_number += 1
+            sprint_points = 0
+            sprint_stories = []
+        sprint_stories.append(story)
+        sprint_points += points
+
+    if sprint_stories:
+        allocation.append({"sprint": sprint_number, "stories": [s["title"] for s in sprint_stories]})
+
+    return allocation
+
+
+def _stories(points):
+    return [{"title": f"Story {i}", "estimated_points": p} for i, p in enumerate(points)]
+
+
+def _model():
+    # _allocate_to_sprints uses no instance state, so skip loading the story analyzer
+    return FeatureBreakdownModel.__new__(FeatureBreakdownModel)
+
+
+def test_allocate_to_sprints_empty():
+    assert _model()._allocate_to_sprints([]) == []
+
+
+def test_allocate_to_sprints_oversized_stories():
+    model = _model()
+    cases = [
+        [25],  # larger than capacity on an empty first sprint
+        [5, 30, 3],  # larger than capacity mid-run
+        [21, 21],  # consecutive oversized stories
+        [20, 1, 19, 1],  # exact fits at the boundary
+    ]
+    for points in cases:
+        stories = _stories(points)
+        assert model._allocate_to_sprints(stories, capacity=20) == _reference_allocation(stories, 20)
+
+
+def test_allocate_to_sprints_matches_reference_loop():
+    model = _model()
+    rng = random.Random(0)
+    for _ in range(500):
+        capacity = rng.choice([5, 13, 20, 40])
+        points = [rng.choice([0, 1, 2, 3, 5, 8, 13, 21, 34]) for _ in range(rng.randint(1, 60))]
+        stories = _stories(points)
+        assert model._allocate_to_sprints(stories, capacity) == _reference_allocation(stories, capacity)
+
+
+def test_pack_sprints_array_and_list_inputs_agree():
+    rng = random.Random(1)
+    kernels = [_pack_sprints]
+    if feature_breakdown._pack_sprints_jit is not None:
+        kernels.append(feature_breakdown._pack_sprints_jit)
+    for _ in range(100):
+        points = [rng.choice([1, 2, 3, 5, 8, 13, 21]) for _ in range(rng.randint(1, 40))]
+        expected_of = [0] * len(points)
+        expected_count = _pack_sprints(points, 20, expected_of)
+        for kernel in kernels:
+            sprint_of = np.empty(len(points), dtype=np.int64)
+            assert kernel(np.asarray(points, dtype=np.float64), 20.0, sprint_of) == expected_count
+            assert sprint_of.tolist() == expected_of